@@ -0,0 +1,159 @@
+"""
+Benchmark harness for the Library Book Management System.
+Times and measures peak memory of the list functions on synthetic catalogs and emits JSON results.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from library_management_system import (
+    GENRES, Catalog, aggregate_statistics, calculate_average_popularity, calculate_genre_counts,
+    filter_by_availability, filter_by_decade, filter_by_genre, filter_by_keyword, filter_by_year_range, generate_citations,
+    get_book_availability, get_formatted_book, initialize_data, integrate_new_arrivals, query,
+    set_engine, top_popular_books, transform_titles,
+)
+
+DEFAULT_SIZES = [1000, 100000, 10000000]
+GENRE_WEIGHTS = [0.35, 0.25, 0.1, 0.2, 0.1]
+TITLE_WORDS = ["Python", "Mystery", "History", "Dragon", "Quest", "Life", "Data", "Science", "Quantum", "Midnight",
+               "Garden", "River", "Empire", "Journey", "Secret", "Ocean", "Machine", "Winter", "Shadow", "Light"]
+FIRST_NAMES = ["John", "Jane", "Alan", "Emily", "Robert", "Sarah", "Richard", "Maria", "David", "Aisha", "Wei", "Olga"]
+LAST_NAMES = ["Smith", "Doe", "Turing", "Johnson", "Brown", "Miller", "Feynman", "Garcia", "Chen", "Okafor", "Ivanova", "Khan"]
+REGRESSION_THRESHOLD = 1.2
+
+def generate_books(size, seed=0, prefix="B"):
+    """Generate size book dictionaries with the initialize_data() schema and skewed, realistic distributions."""
+    rng = random.Random(seed)
+    # A fixed author pool so authors repeat the way they do in a real catalog
+    authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(max(1, size // 20))]
+    genres = rng.choices(GENRES, GENRE_WEIGHTS, k=size)
+    books = []
+    for position in range(size):
+        books.append({
+            "id": f"{prefix}{position + 1:07d}",
+            "title": " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 4))),
+            "author": rng.choice(authors),
+            "genre": genres[position],
+            # Publication years lean towards recent decades
+            "publication_year": int(rng.triangular(1900, 2024, 2018)),
+            "available": rng.random() < 0.7,
+            "popularity_score": round(min(5.0, max(1.0, rng.gauss(3.8, 0.6))), 1),
+        })
+    return books
+
+def generate_catalog(size, seed=0, columnar=False):
+    """Return synthetic books and new arrivals, starting from the predefined books of initialize_data()."""
+    books, new_arrivals = initialize_data()
+    books = books + generate_books(max(0, size - len(books)), seed)
+    new_arrivals = new_arrivals + generate_books(max(0, size // 100 - len(new_arrivals)), seed + 1, prefix="N")
+    if columnar:
+        return Catalog(books), Catalog(new_arrivals)
+    return books, new_arrivals
+
+def benchmark_calls(books, new_arrivals):
+    """Return the (name, call) pairs measured for one catalog."""
+    return [
+        ("filter_by_genre", lambda: filter_by_genre(books, "fiction")),
+        ("filter_by_availability", lambda: filter_by_availability(books, True)),
+        ("filter_by_decade", lambda: filter_by_decade(books, 2010)),
+        ("filter_by_year_range", lambda: filter_by_year_range(books, 1995, 2004)),
+        ("filter_by_keyword", lambda: filter_by_keyword(books, "dragon")),
+        ("query", lambda: query(books).genre("reference").available().decade(2010).results()),
+        ("transform_titles", lambda: transform_titles(books, "upper")),
+        ("generate_citations", lambda: generate_citations(books)),
+        ("get_book_availability", lambda: get_book_availability(books)),
+        ("calculate_genre_counts", lambda: calculate_genre_counts(books)),
+        ("calculate_average_popularity", lambda: calculate_average_popularity(books)),
+        ("aggregate_statistics", lambda: aggregate_statistics(books)),
+        ("top_popular_books", lambda: top_popular_books(books, 10)),
+        ("integrate_new_arrivals", lambda: integrate_new_arrivals(books, new_arrivals)),
+        ("get_formatted_book", lambda: [get_formatted_book(book) for book in books]),
+    ]
+
+def measure(call, repeat):
+    """Time a call repeat times, then run it once more under tracemalloc for its peak allocation."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - start)
+    # Traced separately: tracemalloc slows allocation-heavy code too much to share a run with the timings
+    tracemalloc.start()
+    call()
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "best_seconds": min(timings),
+        "mean_seconds": sum(timings) / len(timings),
+        "peak_bytes": peak_bytes,
+        "result_size": len(result) if hasattr(result, "__len__") else 1,
+    }
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, columnar=False, engine="python", seed=0, functions=None):
+    """Benchmark every measured function at each catalog size and return a JSON-ready report."""
+    set_engine(engine)
+    results = []
+    try:
+        for size in sizes:
+            books, new_arrivals = generate_catalog(size, seed, columnar)
+            for name, call in benchmark_calls(books, new_arrivals):
+                if functions is None or name in functions:
+                    results.append({"function": name, "size": size, **measure(call, repeat)})
+    finally:
+        set_engine("python")
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "collection": "catalog" if columnar else "list",
+        "engine": engine,
+        "repeat": repeat,
+        "seed": seed,
+        "results": results,
+    }
+
+def find_regressions(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """Return the results whose best time is more than threshold times the baseline's for the same function and size."""
+    previous = {(result["function"], result["size"]): result for result in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get((result["function"], result["size"]))
+        if before is not None and result["best_seconds"] > before["best_seconds"] * threshold:
+            regressions.append({**result, "baseline_seconds": before["best_seconds"], "ratio": result["best_seconds"] / before["best_seconds"]})
+    return regressions
+
+def main(argv=None):
+    """Command line entry point; exits with status 1 when a baseline is given and a regression is found."""
+    parser = argparse.ArgumentParser(description="Benchmark the library list functions on synthetic catalogs.")
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")], default=DEFAULT_SIZES, help="comma-separated catalog sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per function")
+    parser.add_argument("--columnar", action="store_true", help="benchmark a Catalog instead of a list of dictionaries")
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--functions", type=lambda text: text.split(","), help="comma-separated subset of functions")
+    parser.add_argument("--output", help="write the JSON report to this path instead of stdout")
+    parser.add_argument("--baseline", help="JSON report from a previous release to compare against")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.repeat, args.columnar, args.engine, args.seed, args.functions)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            report["regressions"] = find_regressions(report, json.load(baseline_file), args.threshold)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 1 if report.get("regressions") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
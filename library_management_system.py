@@ -3,8 +3,50 @@ Library Book Management System (Simplified)
 This program demonstrates list comprehension techniques through a library management system.
 """
 
-def initialize_data():
-    """Initialize the library data with predefined books and new arrivals."""
+import asyncio
+import bisect
+import contextlib
+import csv
+import functools
+import heapq
+import io
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import operator
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+GENRES = ["fiction", "non-fiction", "reference", "children", "biography"]
+ID_PATTERN = r"[A-Z]+[0-9]+"
+BOOK_FIELDS = ["id", "title", "author", "genre", "publication_year", "available", "popularity_score"]
+ENGINES = ["python", "numpy"]
+PAGE_SIZE = 20
+DISPLAY_BATCH = 1000
+FORMAT_CACHE_SIZE = 4096
+QUERY_CACHE_SIZE = 256
+VALIDATION_BATCH = 4096
+YEAR_BUFFER = 256
+
+_engine = "python"
+_profiler = None
+
+def initialize_data(columnar=False, records=False, books_path=None, new_arrivals_path=None):
+    """Initialize the library data with predefined books and new arrivals, or import them from CSV/JSONL exports."""
     books = [
         {"id": "B001", "title": "Python Fundamentals", "author": "John Smith", "genre": "reference", "publication_year": 2019, "available": True, "popularity_score": 4.5},
         {"id": "B002", "title": "Mystery at Midnight", "author": "Jane Doe", "genre": "fiction", "publication_year": 2018, "available": False, "popularity_score": 4.2},
@@ -18,140 +60,2275 @@ def initialize_data():
         {"id": "N002", "title": "Quantum Physics Simplified", "author": "Richard Feynman", "genre": "non-fiction", "publication_year": 2022, "available": True, "popularity_score": 4.3}
     ]
     
+    if books_path is not None:
+        books = import_books(books_path, columnar=columnar)
+    if new_arrivals_path is not None:
+        new_arrivals = import_books(new_arrivals_path, columnar=columnar)
+    
+    if columnar:
+        books = books if isinstance(books, Catalog) else Catalog(books)
+        new_arrivals = new_arrivals if isinstance(new_arrivals, Catalog) else Catalog(new_arrivals)
+    elif records:
+        books, new_arrivals = [Book.from_dict(book) for book in books], [Book.from_dict(book) for book in new_arrivals]
     return books, new_arrivals
 
+class Book:
+    """Compact __slots__ book record that also supports dictionary-style book["field"] access."""
+
+    __slots__ = BOOK_FIELDS + ["section"]
+
+    def __init__(self, id, title, author, genre, publication_year, available, popularity_score, section=None):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.genre = genre
+        self.publication_year = publication_year
+        self.available = available
+        self.popularity_score = popularity_score
+        self.section = section
+
+    @classmethod
+    def from_dict(cls, book):
+        """Build a Book from a book dictionary."""
+        for field in BOOK_FIELDS:
+            if field not in book:
+                raise ValueError(f"Book is missing required field: {field}")
+        return cls(*[book[field] for field in BOOK_FIELDS], section=book.get("section"))
+
+    def keys(self):
+        return BOOK_FIELDS if self.section is None else BOOK_FIELDS + ["section"]
+
+    def values(self):
+        return [getattr(self, key) for key in self.keys()]
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self else default
+
+    def copy(self):
+        return self.with_section(self.section)
+
+    def with_section(self, section):
+        """Return a copy of the record placed in the given section."""
+        return Book(*[getattr(self, field) for field in BOOK_FIELDS], section=section)
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in Book.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in BOOK_FIELDS or (key == "section" and self.section is not None)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (Book, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Book({self.to_dict()!r})"
+
+class Catalog:
+    """Columnar book store keeping each field in its own parallel array."""
+
+    def __init__(self, books=None):
+        self.ids = []
+        self.titles = []
+        self.author_table = []
+        self.author_codes = array("I")
+        self.genre_table = list(GENRES)
+        self.genre_codes = array("H")
+        self.years = array("h")
+        self.popularity = array("d")
+        self.available_bits = bytearray()
+        self.extras = {}
+        self.book_index = None
+        self.listeners = ()
+        self._author_lookup = {}
+        self._genre_lookup = {genre: code for code, genre in enumerate(self.genre_table)}
+        if books is not None:
+            self.extend(books)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return (self[position] for position in range(len(self.ids)))
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self.ids)
+        if not 0 <= position < len(self.ids):
+            raise IndexError("Catalog index out of range")
+        book = {
+            "id": self.ids[position],
+            "title": self.titles[position],
+            "author": self.author_table[self.author_codes[position]],
+            "genre": self.genre_table[self.genre_codes[position]],
+            "publication_year": self.years[position],
+            "available": self.is_available(position),
+            "popularity_score": self.popularity[position],
+        }
+        if position in self.extras:
+            book.update(self.extras[position])
+        return book
+
+    def __setitem__(self, position, book):
+        """Overwrite the row at a position with a book dictionary."""
+        year, score = self._fixed_width(book)
+        if position < 0:
+            position += len(self.ids)
+        old = self[position]
+        self.ids[position] = book["id"]
+        self.titles[position] = book["title"]
+        self.author_codes[position] = self._intern(book["author"], self.author_table, self._author_lookup)
+        self.genre_codes[position] = self._intern(book["genre"], self.genre_table, self._genre_lookup)
+        self.years[position] = year
+        self.popularity[position] = score
+        self.set_available(position, book["available"])
+        extra = {key: value for key, value in book.items() if key not in BOOK_FIELDS}
+        if extra:
+            self.extras[position] = extra
+        else:
+            self.extras.pop(position, None)
+        if self.book_index is not None:
+            self.book_index.replace(position, old, book)
+        _notify(self, "on_update", old, book)
+
+    def append(self, book):
+        """Append a book dictionary as a new row."""
+        year, score = self._fixed_width(book)
+        position = len(self.ids)
+        self.ids.append(book["id"])
+        self.titles.append(book["title"])
+        self.author_codes.append(self._intern(book["author"], self.author_table, self._author_lookup))
+        self.genre_codes.append(self._intern(book["genre"], self.genre_table, self._genre_lookup))
+        self.years.append(year)
+        self.popularity.append(score)
+        if position % 8 == 0:
+            self.available_bits.append(0)
+        self.set_available(position, book["available"])
+        extra = {key: value for key, value in book.items() if key not in BOOK_FIELDS}
+        if extra:
+            self.extras[position] = extra
+        if self.book_index is not None:
+            self.book_index.add([book])
+        _notify(self, "on_add", [book])
+
+    def extend(self, books):
+        """Append every book from an iterable of book dictionaries."""
+        for book in books:
+            self.append(book)
+
+    def pop(self, position):
+        """Remove the row at a position and return it as a book dictionary."""
+        book = self[position]
+        if position < 0:
+            position += len(self.ids)
+        for column in (self.ids, self.titles, self.author_codes, self.genre_codes, self.years, self.popularity):
+            del column[position]
+        # The bits above the removed row move down one place, shifted as a single integer
+        bits = int.from_bytes(self.available_bits, "little")
+        bits = (bits & ((1 << position) - 1)) | ((bits >> (position + 1)) << position)
+        self.available_bits = bytearray(bits.to_bytes((len(self.ids) + 7) // 8, "little"))
+        self.extras = {extra_position - (extra_position > position): extra for extra_position, extra in self.extras.items() if extra_position != position}
+        if self.book_index is not None:
+            self.book_index.remove(position, book)
+        _notify(self, "on_remove", book)
+        return book
+
+    def copy(self):
+        """Return an independent copy of the catalog."""
+        catalog = Catalog()
+        catalog.ids = list(self.ids)
+        catalog.titles = list(self.titles)
+        catalog.author_table = list(self.author_table)
+        catalog.author_codes = array("I", self.author_codes)
+        catalog.genre_table = list(self.genre_table)
+        catalog.genre_codes = array("H", self.genre_codes)
+        catalog.years = array("h", self.years)
+        catalog.popularity = array("d", self.popularity)
+        catalog.available_bits = bytearray(self.available_bits)
+        catalog.extras = {position: dict(extra) for position, extra in self.extras.items()}
+        catalog._author_lookup = {author: code for code, author in enumerate(catalog.author_table)}
+        catalog._genre_lookup = {genre: code for code, genre in enumerate(catalog.genre_table)}
+        return catalog
+
+    def genre_code(self, genre):
+        """Return the interned code for a genre, or None if no book uses it."""
+        return self._genre_lookup.get(genre)
+
+    def author_at(self, position):
+        return self.author_table[self.author_codes[position]]
+
+    def authors(self):
+        """Iterate over the author column."""
+        return (self.author_table[code] for code in self.author_codes)
+
+    def is_available(self, position):
+        return bool(self.available_bits[position >> 3] & (1 << (position & 7)))
+
+    def availability(self):
+        """Iterate over the availability column."""
+        return (self.is_available(position) for position in range(len(self.ids)))
+
+    def set_available(self, position, available):
+        if available:
+            self.available_bits[position >> 3] |= 1 << (position & 7)
+        else:
+            self.available_bits[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+
+    @staticmethod
+    def _fixed_width(book):
+        """Check a book and convert its year and score before any column changes, so a bad value cannot leave columns of different lengths."""
+        for field in BOOK_FIELDS:
+            if field not in book:
+                raise ValueError(f"Book is missing required field: {field}")
+        try:
+            year = array("h", [book["publication_year"]])[0]
+        except (TypeError, OverflowError):
+            raise ValueError("publication_year must be an integer between -32768 and 32767")
+        try:
+            score = array("d", [book["popularity_score"]])[0]
+        except TypeError:
+            raise ValueError("popularity_score must be a number")
+        return year, score
+
+    @staticmethod
+    def _intern(value, table, lookup):
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(table)
+            table.append(value)
+        return code
+
+class _StringColumn:
+    """Read-only sequence of strings decoded on access from a UTF-8 heap and an offsets array."""
+
+    __slots__ = ("heap", "offsets")
+
+    def __init__(self, heap, offsets):
+        self.heap = heap
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("String column index out of range")
+        return str(self.heap[self.offsets[position]:self.offsets[position + 1]], "utf-8")
+
+    def __iter__(self):
+        heap, offsets = self.heap, self.offsets
+        return (str(heap[offsets[position]:offsets[position + 1]], "utf-8") for position in range(len(offsets) - 1))
+
+class MappedCatalog(Catalog):
+    """Catalog whose columns are read in place from a memory-mapped binary catalog file."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.modified = False
+        with open(path, "rb") as catalog_file:
+            # Copy-on-write mapping: availability can change in memory without touching the file
+            self._mmap = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_COPY)
+        view = memoryview(self._mmap)
+        if len(view) < _CATALOG_HEADER.size:
+            raise ValueError(f"Not a version {CATALOG_VERSION} binary catalog: {path}")
+        magic, byte_order, version, count, author_count, genre_count, heap_size, extras_size = _CATALOG_HEADER.unpack_from(view)
+        if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+            raise ValueError(f"Not a version {CATALOG_VERSION} binary catalog: {path}")
+        if byte_order != sys.byteorder[0].encode():
+            raise ValueError(f"Binary catalog byte order does not match this machine: {path}")
+        sections = []
+        offset = _CATALOG_HEADER.size
+        for name, typecode, length in _catalog_layout(count, author_count, genre_count, heap_size, extras_size):
+            offset = _align(offset)
+            size = length * (struct.calcsize(typecode) if typecode else 1)
+            sections.append((name, typecode, offset, size))
+            offset += size
+        # A short slice would fail the cast below with an opaque TypeError
+        if offset > len(view):
+            raise ValueError(f"Binary catalog is truncated ({len(view)} of {offset} bytes): {path}")
+        columns = {name: view[start:start + size].cast(typecode) if typecode else view[start:start + size] for name, typecode, start, size in sections}
+        heap = columns["heap"]
+        self.ids = _StringColumn(heap, columns["id_offsets"])
+        self.titles = _StringColumn(heap, columns["title_offsets"])
+        self.author_table = _StringColumn(heap, columns["author_offsets"])
+        self.author_codes = columns["author_codes"]
+        self.genre_table = list(_StringColumn(heap, columns["genre_offsets"]))
+        self.genre_codes = columns["genre_codes"]
+        self.years = columns["years"]
+        self.popularity = columns["popularity"]
+        self.available_bits = columns["available_bits"]
+        self.extras = {int(position): extra for position, extra in json.loads(str(columns["extras"], "utf-8") or "{}").items()}
+        self._genre_lookup = {genre: code for code, genre in enumerate(self.genre_table)}
+
+    def append(self, book):
+        raise TypeError("Mapped catalogs are read-only; use copy() for an editable Catalog")
+
+    def __setitem__(self, position, book):
+        raise TypeError("Mapped catalogs are read-only; use copy() for an editable Catalog")
+
+    def pop(self, position):
+        raise TypeError("Mapped catalogs are read-only; use copy() for an editable Catalog")
+
+    def set_available(self, position, available):
+        super().set_available(position, available)
+        self.modified = True
+
+CATALOG_MAGIC = b"LBMC"
+CATALOG_VERSION = 1
+_CATALOG_HEADER = struct.Struct("<4s1sHIIIQI")
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+def _catalog_layout(count, author_count, genre_count, heap_size, extras_size):
+    """Return the (name, typecode, length) sections of a binary catalog, in file order."""
+    return [
+        ("popularity", "d", count),
+        ("id_offsets", "Q", count + 1),
+        ("title_offsets", "Q", count + 1),
+        ("author_offsets", "Q", author_count + 1),
+        ("genre_offsets", "Q", genre_count + 1),
+        ("author_codes", "I", count),
+        ("genre_codes", "H", count),
+        ("years", "h", count),
+        ("available_bits", None, (count + 7) // 8),
+        ("heap", None, heap_size),
+        ("extras", None, extras_size),
+    ]
+
+class BookList(list):
+    """List of book dictionaries that can carry an attached BookIndex and mutation listeners."""
+
+    book_index = None
+    listeners = ()
+
+    def append(self, book):
+        super().append(book)
+        if self.book_index is not None:
+            self.book_index.add([book])
+        _notify(self, "on_add", [book])
+
+    def extend(self, books):
+        books = list(books)
+        super().extend(books)
+        if self.book_index is not None:
+            self.book_index.add(books)
+        _notify(self, "on_add", books)
+
+    def __iadd__(self, books):
+        self.extend(books)
+        return self
+
+    def insert(self, position, book):
+        # Clamp as list.insert does, so the index sees the position the book lands at
+        position = max(0, position + len(self)) if position < 0 else min(position, len(self))
+        super().insert(position, book)
+        if self.book_index is not None:
+            self.book_index.insert(position, book)
+        _notify(self, "on_add", [book])
+
+    def __setitem__(self, position, book):
+        if isinstance(position, slice):
+            old, book = self[position], list(book)
+            super().__setitem__(position, book)
+            self._reindex()
+            for removed in old:
+                _notify(self, "on_remove", removed)
+            _notify(self, "on_add", book)
+            return
+        if position < 0:
+            position += len(self)
+        old = self[position]
+        super().__setitem__(position, book)
+        if self.book_index is not None:
+            self.book_index.replace(position, old, book)
+        _notify(self, "on_update", old, book)
+
+    def __delitem__(self, position):
+        positions = range(len(self))[position] if isinstance(position, slice) else [range(len(self))[position]]
+        removed = [self[book_position] for book_position in positions]
+        super().__delitem__(position)
+        if self.book_index is not None:
+            # Highest first, so the positions still to be removed do not shift
+            for book_position, book in sorted(zip(positions, removed), key=operator.itemgetter(0), reverse=True):
+                self.book_index.remove(book_position, book)
+        for book in removed:
+            _notify(self, "on_remove", book)
+
+    def pop(self, position=-1):
+        if position < 0:
+            position += len(self)
+        book = super().pop(position)
+        if self.book_index is not None:
+            self.book_index.remove(position, book)
+        _notify(self, "on_remove", book)
+        return book
+
+    def remove(self, book):
+        self.pop(self.index(book))
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        raise TypeError("Reordering would invalidate the attached index; sort a copy such as sorted(books)")
+
+    def reverse(self):
+        raise TypeError("Reordering would invalidate the attached index; reverse a copy such as books[::-1]")
+
+    def __imul__(self, count):
+        raise TypeError("Repeating the books would duplicate their ids in the attached index")
+
+    def _reindex(self):
+        # A slice assignment can change the length, so an attached index is rebuilt
+        if self.book_index is not None:
+            self.book_index = BookIndex(self)
+
+class ValidatedBooks(BookList):
+    """BookList whose records are checked for every required field on the way in, so its rows are trusted."""
+
+    def __init__(self, books=()):
+        books = list(books)
+        _require_fields(books)
+        super().__init__(books)
+
+    @classmethod
+    def trusted(cls, books):
+        """Wrap rows that have already been checked without checking them again."""
+        validated = cls.__new__(cls)
+        list.__init__(validated, books)
+        return validated
+
+    def append(self, book):
+        _require_fields([book])
+        super().append(book)
+
+    def extend(self, books):
+        books = list(books)
+        _require_fields(books)
+        super().extend(books)
+
+    def insert(self, position, book):
+        _require_fields([book])
+        super().insert(position, book)
+
+    def __setitem__(self, position, book):
+        books = list(book) if isinstance(position, slice) else [book]
+        _require_fields(books)
+        super().__setitem__(position, books if isinstance(position, slice) else book)
+
+REQUIRED_FIELDS = frozenset(BOOK_FIELDS)
+
+def _require_fields(books):
+    """Check a batch of records for the required fields, raising on the first bad row."""
+    # One C-level subset test per row; rows are only re-examined to build the error
+    invalid = [position for position, book in enumerate(books) if not isinstance(book, BOOK_RECORDS) or not REQUIRED_FIELDS.issubset(book)]
+    if invalid:
+        book = books[invalid[0]]
+        if not isinstance(book, BOOK_RECORDS):
+            raise TypeError(f"Book at position {invalid[0]} must be a dictionary or book record")
+        missing = next(field for field in BOOK_FIELDS if field not in book)
+        raise ValueError(f"Book at position {invalid[0]} is missing required field: {missing}")
+
+class SectionedBook:
+    """Read-through view of a book record that adds a derived section field without copying."""
+
+    __slots__ = ("book", "section")
+
+    def __init__(self, book, section):
+        self.book = book
+        self.section = section
+
+    def keys(self):
+        return [key for key in self.book.keys() if key != "section"] + ["section"]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __getitem__(self, key):
+        return self.section if key == "section" else self.book[key]
+
+    def __setitem__(self, key, value):
+        if key == "section":
+            self.section = value
+        else:
+            self.book[key] = value
+
+    def __contains__(self, key):
+        return key == "section" or key in self.book
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, Book, SectionedBook)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SectionedBook({dict(self.items())!r})"
+
+class ChainedBooks:
+    """Read-through sequence over several book collections, each optionally tagged with a section."""
+
+    def __init__(self, *segments):
+        self.segments = []
+        for books, section in segments:
+            if isinstance(books, ChainedBooks) and section is None:
+                self.segments.extend(books.segments)
+            else:
+                self.segments.append((books, section))
+
+    def __len__(self):
+        return sum(len(books) for books, section in self.segments)
+
+    def __iter__(self):
+        for books, section in self.segments:
+            for book in books:
+                yield book if section is None else SectionedBook(book, section)
+
+    def _locate(self, position):
+        if position < 0:
+            position += len(self)
+        for segment, (books, section) in enumerate(self.segments):
+            if 0 <= position < len(books):
+                return segment, position
+            position -= len(books)
+        raise IndexError("ChainedBooks index out of range")
+
+    def __getitem__(self, position):
+        segment, offset = self._locate(position)
+        books, section = self.segments[segment]
+        return books[offset] if section is None else SectionedBook(books[offset], section)
+
+    def pop(self, position):
+        """Remove a book from the underlying collection it lives in."""
+        segment, offset = self._locate(position)
+        books, section = self.segments[segment]
+        book = books.pop(offset)
+        return book if section is None else SectionedBook(book, section)
+
+BOOK_COLLECTIONS = (list, Catalog, ChainedBooks)
+BOOK_RECORDS = (dict, Book, SectionedBook)
+
+def _notify(books, event, *args):
+    """Forward a mutation event to every listener subscribed to the books."""
+    for listener in getattr(books, "listeners", ()):
+        getattr(listener, event)(*args)
+
+class LiveStats:
+    """Running collection statistics kept current by mutation events instead of rescans."""
+
+    def __init__(self, books=(), top_k=3):
+        self.top_k = top_k
+        self.total_books = 0
+        self.available_books = 0
+        self.genre_counts = {genre: 0 for genre in GENRES}
+        self.popularity_total = 0.0
+        self._heap = []
+        self._entries = {}
+        self._sequence = 0
+        self._serials = itertools.count()
+        self.on_add(books)
+
+    @property
+    def on_loan_books(self):
+        return self.total_books - self.available_books
+
+    @property
+    def average_popularity(self):
+        return round(self.popularity_total / self.total_books, 2) if self.total_books else 0.0
+
+    def _count(self, book, sign):
+        self.total_books += sign
+        if book["available"]:
+            self.available_books += sign
+        if book["genre"] in self.genre_counts:
+            self.genre_counts[book["genre"]] += sign
+        self.popularity_total += sign * book["popularity_score"]
+
+    def on_add(self, books):
+        for book in books:
+            self._count(book, 1)
+            # Heap entries are [-score, sequence, serial, book, alive]; removals only clear the alive flag
+            entry = [-book["popularity_score"], self._sequence, next(self._serials), book, True]
+            self._sequence += 1
+            heapq.heappush(self._heap, entry)
+            self._entries.setdefault(book["id"], []).append(entry)
+
+    def on_availability(self, book, available):
+        self.available_books += 1 if available else -1
+        # The event carries the current record; swap it into the entry rather than editing the one held
+        entries = self._entries.get(book["id"])
+        if entries:
+            entries[0][3] = book
+
+    def on_remove(self, book):
+        self._count(book, -1)
+        entries = self._entries.get(book["id"])
+        if entries:
+            entries.pop(0)[4] = False
+            if not entries:
+                del self._entries[book["id"]]
+
+    def on_update(self, old, new):
+        self._count(old, -1)
+        self._count(new, 1)
+        # The replacement keeps the old sequence number so ties still follow catalog order
+        sequence = self._sequence
+        entries = self._entries.get(old["id"])
+        if entries:
+            entry = entries.pop(0)
+            entry[4] = False
+            sequence = entry[1]
+            if not entries:
+                del self._entries[old["id"]]
+        else:
+            self._sequence += 1
+        replacement = [-new["popularity_score"], sequence, next(self._serials), new, True]
+        heapq.heappush(self._heap, replacement)
+        self._entries.setdefault(new["id"], []).insert(0, replacement)
+
+    def top_books(self, k=None):
+        """Return the k most popular books, popping past entries of removed books."""
+        k = self.top_k if k is None else k
+        live = []
+        while self._heap and len(live) < k:
+            entry = heapq.heappop(self._heap)
+            if entry[4]:
+                live.append(entry)
+        for entry in live:
+            heapq.heappush(self._heap, entry)
+        return [entry[3] for entry in live]
+
+class FormatCache:
+    """Bounded LRU of formatted book rows keyed by book id and checked against the record's fields; mutation events drop the rows of changed books."""
+
+    def __init__(self, maxsize=FORMAT_CACHE_SIZE):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("Max size must be a positive integer")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._rows = OrderedDict()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def format(self, book):
+        """Return the formatted row for a book, validating and formatting it only on a miss."""
+        key = book.get("id")
+        # A row is reused only for the same field values, so another record with this id misses
+        fingerprint = tuple(book.items())
+        entry = self._rows.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        row = get_formatted_book(book)
+        self.misses += 1
+        self._rows[key] = (fingerprint, row)
+        self._rows.move_to_end(key)
+        if len(self._rows) > self.maxsize:
+            self._rows.popitem(last=False)
+        return row
+
+    def invalidate(self, book_id):
+        """Drop the cached row of a book so its next display is formatted afresh."""
+        self._rows.pop(book_id, None)
+
+    def clear(self):
+        self._rows.clear()
+
+    def on_add(self, books):
+        # An added id may reuse one formatted from another collection
+        for book in books:
+            self.invalidate(book["id"])
+
+    def on_availability(self, book, available):
+        self.invalidate(book["id"])
+
+    def on_remove(self, book):
+        self.invalidate(book["id"])
+
+    def on_update(self, old, new):
+        self.invalidate(old["id"])
+        self.invalidate(new["id"])
+
+class QueryCache:
+    """Bounded LRU of filter results keyed by (function, args, collection version)."""
+
+    def __init__(self, maxsize=QUERY_CACHE_SIZE):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("Max size must be a positive integer")
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._results)
+
+    def fetch(self, function, books, args, kwargs):
+        """Return a cached result of function(books, *args, **kwargs), computing it on a miss."""
+        key = (function.__name__, _typed_args(args), _typed_args(sorted(kwargs.items())), self.version)
+        try:
+            result = self._results.get(key)
+        except TypeError:
+            # Unhashable arguments are left to the function's own validation
+            return function(books, *args, **kwargs)
+        if result is not None:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return list(result)
+        result = function(books, *args, **kwargs)
+        self.misses += 1
+        self._results[key] = list(result)
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return result
+
+    def invalidate(self):
+        """Move to a new collection version, dropping every cached result."""
+        self.version += 1
+        self._results.clear()
+
+    def on_add(self, books):
+        self.invalidate()
+
+    def on_availability(self, book, available):
+        self.invalidate()
+
+    def on_remove(self, book):
+        self.invalidate()
+
+    def on_update(self, old, new):
+        self.invalidate()
+
+def _typed_args(args):
+    """Pair each argument with its type so True, 1 and 1.0 do not share a cache entry."""
+    return tuple((type(arg), arg) for arg in args)
+
+def _cached_query(function):
+    """Serve a filter from the QueryCache subscribed to its books, if there is one."""
+    @functools.wraps(function)
+    def cached(books, *args, **kwargs):
+        cache = next((listener for listener in getattr(books, "listeners", ()) if isinstance(listener, QueryCache)), None)
+        if cache is None:
+            return function(books, *args, **kwargs)
+        return cache.fetch(function, books, args, kwargs)
+    return cached
+
+def _row_count(value):
+    return len(value) if isinstance(value, BOOK_COLLECTIONS) else 0
+
+class Profiler(contextlib.ContextDecorator):
+    """Per-function call counts, latency histograms, row counts and allocated blocks, recorded while the profiler is active."""
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = threading.Lock()
+        self._previous = []
+
+    def __enter__(self):
+        global _profiler
+        self._previous.append(_profiler)
+        _profiler = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _profiler
+        _profiler = self._previous.pop()
+        return False
+
+    def record(self, function, args, kwargs):
+        """Call a function and add its latency, input and output rows and net allocated blocks to its stats."""
+        blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        allocated = sys.getallocatedblocks() - blocks
+        with self._lock:
+            stats = self.stats.get(function.__name__)
+            if stats is None:
+                stats = self.stats[function.__name__] = {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0, "rows_in": 0, "rows_returned": 0, "allocated_blocks": 0, "histogram": Counter()}
+            stats["calls"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            # Size of the input collection; indexed and cached calls may touch far fewer rows
+            stats["rows_in"] += _row_count(args[0]) if args else 0
+            stats["rows_returned"] += _row_count(result)
+            stats["allocated_blocks"] += max(0, allocated)
+            # Power-of-two microsecond buckets: bucket n holds calls shorter than 2**n us
+            stats["histogram"][int(elapsed * 1e6).bit_length()] += 1
+        return result
+
+    def to_dict(self):
+        """Return the stats as plain data with mean latency and labelled histogram buckets."""
+        with self._lock:
+            return {
+                name: {
+                    **{key: value for key, value in stats.items() if key != "histogram"},
+                    "mean_seconds": stats["total_seconds"] / stats["calls"],
+                    "histogram": {f"<{2 ** bucket}us": count for bucket, count in sorted(stats["histogram"].items())},
+                }
+                for name, stats in sorted(self.stats.items())
+            }
+
+    def dump(self, file_format="text"):
+        """Render the profile as an aligned text table or as JSON."""
+        if file_format not in ("text", "json"):
+            raise ValueError("File format must be 'text' or 'json'")
+        profile = self.to_dict()
+        if file_format == "json":
+            return json.dumps(profile, indent=2)
+        lines = [f"{'function':<30} {'calls':>7} {'mean ms':>9} {'max ms':>9} {'in':>9} {'returned':>9} {'blocks':>8}"]
+        for name, stats in profile.items():
+            lines.append(f"{name:<30} {stats['calls']:>7} {stats['mean_seconds'] * 1000:>9.3f} {stats['max_seconds'] * 1000:>9.3f} {stats['rows_in']:>9} {stats['rows_returned']:>9} {stats['allocated_blocks']:>8}")
+            lines.append("    " + " ".join(f"{bucket}:{count}" for bucket, count in stats["histogram"].items()))
+        return "\n".join(lines)
+
+def _instrumented(function):
+    """Record calls to a library function on the active Profiler; disabled, this costs one global lookup."""
+    @functools.wraps(function)
+    def instrumented(*args, **kwargs):
+        profiler = _profiler
+        if profiler is None:
+            return function(*args, **kwargs)
+        return profiler.record(function, args, kwargs)
+    return instrumented
+
+def get_profiler():
+    """Return the active Profiler, or None when profiling is off."""
+    return _profiler
+
+def _trigrams(title, author):
+    """Return the distinct three-character substrings of a lower-cased title and author."""
+    return {text[start:start + 3] for text in (title, author) for start in range(len(text) - 2)}
+
+class YearIndex:
+    """Book positions sorted by publication year for bisect range lookups, with appends buffered and merged in."""
+
+    def __init__(self):
+        self.years = []
+        self.positions = []
+        self.pending = []
+
+    def __len__(self):
+        return len(self.years) + len(self.pending)
+
+    def extend(self, entries):
+        """Buffer (year, position) entries, merging once the buffer outgrows the square root of the index."""
+        self.pending.extend(entries)
+        if len(self.pending) > max(YEAR_BUFFER, math.isqrt(len(self.years))):
+            self.merge()
+
+    def merge(self):
+        """Fold the sorted buffer into the sorted columns in one linear pass."""
+        if not self.pending:
+            return
+        # (year, position) order keeps books of the same year in catalog order
+        merged = list(heapq.merge(zip(self.years, self.positions), sorted(self.pending)))
+        self.years = [year for year, position in merged]
+        self.positions = [position for year, position in merged]
+        self.pending = []
+
+    def copy(self):
+        year_index = YearIndex()
+        year_index.years, year_index.positions, year_index.pending = list(self.years), list(self.positions), list(self.pending)
+        return year_index
+
+    def remove(self, year, position):
+        if (year, position) in self.pending:
+            self.pending.remove((year, position))
+            return
+        start = bisect.bisect_left(self.years, year)
+        offset = self.positions.index(position, start, bisect.bisect_right(self.years, year))
+        del self.years[offset]
+        del self.positions[offset]
+
+    def _bounds(self, start, end):
+        low = 0 if start is None else bisect.bisect_left(self.years, start)
+        high = len(self.years) if end is None else bisect.bisect_right(self.years, end)
+        return low, max(low, high)
+
+    def lookup(self, start=None, end=None):
+        """Return the sorted positions of books published from start to end inclusive; None leaves a side open."""
+        low, high = self._bounds(start, end)
+        found = self.positions[low:high] + [position for year, position in self.pending if (start is None or year >= start) and (end is None or year <= end)]
+        return sorted(found)
+
+    def count(self, start=None, end=None):
+        low, high = self._bounds(start, end)
+        return high - low + sum(1 for year, position in self.pending if (start is None or year >= start) and (end is None or year <= end))
+
+class BookIndex:
+    """Secondary indexes mapping genre, availability, publication year and keyword trigrams to book positions."""
+
+    def __init__(self, books=()):
+        # Buckets hold slots rather than positions, so a row can be removed or inserted without
+        # renumbering the rows after it. Slots follow collection order and slots[position] is the
+        # slot of each row; while the index is dense a slot is simply its position, and an
+        # inserted row takes the midpoint of its neighbours' slots
+        self.slots = []
+        self.dense = True
+        self._slot_positions = None
+        self.genre_slots = {}
+        self.year_index = YearIndex()
+        self.available_slots = set()
+        self.on_loan_slots = set()
+        self.id_slots = {}
+        # Later slots of a repeated id, so removing the first hands the id to the next
+        self.duplicate_slots = {}
+        self.search_titles = {}
+        self.search_authors = {}
+        self.trigram_slots = {}
+        self.add(books)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def add(self, books):
+        """Index books appended after the rows already covered."""
+        slot = self.slots[-1] + 1 if self.slots else 0
+        years = []
+        for book in books:
+            if self._slot_positions is not None:
+                self._slot_positions[slot] = len(self.slots)
+            self.slots.append(slot)
+            self._index_book(slot, book)
+            years.append((book["publication_year"], slot))
+            slot += 1
+        self.year_index.extend(years)
+
+    def insert(self, position, book):
+        """Index a book inserted at a position under a slot between those of its neighbours."""
+        if position == len(self.slots):
+            self.add([book])
+            return
+        high = self.slots[position]
+        low = self.slots[position - 1] if position else high - 1
+        slot = (low + high) / 2
+        if not low < slot < high:
+            # Repeated insertions at one place have used up the float precision between two slots
+            self._renumber()
+            self.insert(position, book)
+            return
+        self.slots.insert(position, slot)
+        self.dense = False
+        self._slot_positions = None
+        self._index_book(slot, book)
+        self.year_index.extend([(book["publication_year"], slot)])
+
+    def remove(self, position, book):
+        """Drop the book at a position; the rows after it keep their slots."""
+        slot = self.slots.pop(position)
+        self.dense = self.dense and position == len(self.slots)
+        self._slot_positions = None
+        self._unindex_book(slot, book)
+
+    def replace(self, position, old, new):
+        """Move a position from the buckets of its old record to those of the record replacing it."""
+        slot = self.slots[position]
+        self._unindex_book(slot, old)
+        self._index_book(slot, new)
+        self.year_index.extend([(new["publication_year"], slot)])
+
+    def set_available(self, position, available):
+        """Move a position between the available and on-loan sets."""
+        slot = self.slots[position]
+        if available:
+            self.on_loan_slots.discard(slot)
+            self.available_slots.add(slot)
+        else:
+            self.available_slots.discard(slot)
+            self.on_loan_slots.add(slot)
+
+    def _index_book(self, slot, book):
+        """Add a slot to every bucket except the year index, which callers extend in batches."""
+        bucket = self.genre_slots.setdefault(book["genre"], [])
+        if bucket and bucket[-1] > slot:
+            bisect.insort(bucket, slot)
+        else:
+            bucket.append(slot)
+        (self.available_slots if book["available"] else self.on_loan_slots).add(slot)
+        first = self.id_slots.setdefault(book["id"], slot)
+        if first != slot:
+            self.id_slots[book["id"]] = min(first, slot)
+            bisect.insort(self.duplicate_slots.setdefault(book["id"], []), max(first, slot))
+        # Lower-case once at ingest; trigrams of either field point back to the book
+        title, author = book["title"].lower(), book["author"].lower()
+        self.search_titles[slot] = title
+        self.search_authors[slot] = author
+        for trigram in _trigrams(title, author):
+            self.trigram_slots.setdefault(trigram, set()).add(slot)
+
+    def _unindex_book(self, slot, book):
+        bucket = self.genre_slots[book["genre"]]
+        del bucket[bisect.bisect_left(bucket, slot)]
+        self.year_index.remove(book["publication_year"], slot)
+        self.available_slots.discard(slot)
+        self.on_loan_slots.discard(slot)
+        duplicates = self.duplicate_slots.get(book["id"])
+        if self.id_slots.get(book["id"]) == slot:
+            if duplicates:
+                self.id_slots[book["id"]] = duplicates.pop(0)
+            else:
+                del self.id_slots[book["id"]]
+        elif duplicates and slot in duplicates:
+            duplicates.remove(slot)
+        if duplicates == []:
+            del self.duplicate_slots[book["id"]]
+        for trigram in _trigrams(self.search_titles.pop(slot), self.search_authors.pop(slot)):
+            self.trigram_slots[trigram].discard(slot)
+
+    def _renumber(self):
+        """Make every slot its position again once an insertion finds no slot between two rows."""
+        renumbered = {slot: position for position, slot in enumerate(self.slots)}
+        self.slots = list(range(len(self.slots)))
+        self.dense = True
+        self._slot_positions = None
+        self.genre_slots = {genre: [renumbered[slot] for slot in slots] for genre, slots in self.genre_slots.items()}
+        self.year_index.merge()
+        self.year_index.positions = [renumbered[slot] for slot in self.year_index.positions]
+        self.available_slots = {renumbered[slot] for slot in self.available_slots}
+        self.on_loan_slots = {renumbered[slot] for slot in self.on_loan_slots}
+        self.id_slots = {book_id: renumbered[slot] for book_id, slot in self.id_slots.items()}
+        self.duplicate_slots = {book_id: [renumbered[slot] for slot in slots] for book_id, slots in self.duplicate_slots.items()}
+        self.search_titles = {renumbered[slot]: title for slot, title in self.search_titles.items()}
+        self.search_authors = {renumbered[slot]: author for slot, author in self.search_authors.items()}
+        self.trigram_slots = {trigram: {renumbered[slot] for slot in slots} for trigram, slots in self.trigram_slots.items()}
+
+    def _positions(self, slots):
+        """Translate ascending slots into positions."""
+        if self.dense:
+            return slots
+        if len(slots) < len(self.slots) >> 4:
+            return list(map(functools.partial(bisect.bisect_left, self.slots), slots))
+        # Large results share one slot-to-position map, kept until the next insertion or removal
+        if self._slot_positions is None:
+            self._slot_positions = dict(zip(self.slots, range(len(self.slots))))
+        return list(map(self._slot_positions.__getitem__, slots))
+
+    def copy(self):
+        """Return an independent copy, so a derived collection is indexed without re-reading its books."""
+        index = BookIndex()
+        index.slots = list(self.slots)
+        index.dense = self.dense
+        index.genre_slots = {genre: list(slots) for genre, slots in self.genre_slots.items()}
+        index.year_index = self.year_index.copy()
+        index.available_slots = set(self.available_slots)
+        index.on_loan_slots = set(self.on_loan_slots)
+        index.id_slots = dict(self.id_slots)
+        index.duplicate_slots = {book_id: list(slots) for book_id, slots in self.duplicate_slots.items()}
+        index.search_titles = dict(self.search_titles)
+        index.search_authors = dict(self.search_authors)
+        index.trigram_slots = {trigram: set(slots) for trigram, slots in self.trigram_slots.items()}
+        return index
+
+    def position_of(self, book_id):
+        """Return the position of the first book with an id, or None."""
+        slot = self.id_slots.get(book_id)
+        return None if slot is None else self._positions([slot])[0]
+
+    def genre(self, genre):
+        return self._positions(self.genre_slots.get(genre, []))
+
+    def availability(self, available):
+        return self._positions(sorted(self.available_slots if available else self.on_loan_slots))
+
+    def decade(self, decade):
+        # Only multiples of ten name a decade, as with publication_year // 10 * 10 == decade
+        return self._positions(self.year_index.lookup(decade, decade + 9)) if decade % 10 == 0 else []
+
+    def years(self, start=None, end=None):
+        return self._positions(self.year_index.lookup(start, end))
+
+    def keyword(self, keyword_lower):
+        """Return positions whose lower-cased title or author contains the keyword."""
+        if len(keyword_lower) < 3:
+            candidates = self.slots
+        else:
+            postings = [self.trigram_slots.get(keyword_lower[start:start + 3]) for start in range(len(keyword_lower) - 2)]
+            if None in postings:
+                return []
+            postings.sort(key=len)
+            candidates = sorted(set.intersection(*postings))
+        return self._positions([slot for slot in candidates if keyword_lower in self.search_titles[slot] or keyword_lower in self.search_authors[slot]])
+
+    def estimate(self, criterion, value):
+        """Return an upper bound on the number of positions matching a query criterion."""
+        if criterion == "genre":
+            return len(self.genre_slots.get(value, ()))
+        if criterion == "decade":
+            return self.year_index.count(value, value + 9) if value % 10 == 0 else 0
+        if criterion == "available":
+            return len(self.available_slots if value else self.on_loan_slots)
+        if len(value) < 3:
+            return len(self.slots)
+        return min(len(self.trigram_slots.get(value[start:start + 3], ())) for start in range(len(value) - 2))
+
+    def lookup(self, criterion, value):
+        """Return the sorted positions matching a query criterion."""
+        if criterion == "genre":
+            return self.genre(value)
+        if criterion == "decade":
+            return self.decade(value)
+        if criterion == "available":
+            return self.availability(value)
+        return self.keyword(value)
+
+class BookQuery:
+    """Chainable multi-criteria filter evaluated in a single pass over the books."""
+
+    def __init__(self, books):
+        self.books = books
+        self.criteria = []
+
+    def genre(self, genre):
+        if genre is None:
+            raise ValueError("Genre cannot be None")
+        if not isinstance(genre, str):
+            raise TypeError("Genre must be a string")
+        self.criteria.append(("genre", genre))
+        return self
+
+    def available(self, available=True):
+        if not isinstance(available, bool):
+            raise TypeError("Available must be a boolean")
+        self.criteria.append(("available", available))
+        return self
+
+    def decade(self, decade):
+        if decade is None:
+            raise ValueError("Decade cannot be None")
+        if not isinstance(decade, int):
+            raise TypeError("Decade must be an integer")
+        self.criteria.append(("decade", decade))
+        return self
+
+    def keyword(self, keyword):
+        if keyword is None:
+            raise ValueError("Keyword cannot be None")
+        if not isinstance(keyword, str):
+            raise TypeError("Keyword must be a string")
+        self.criteria.append(("keyword", keyword.lower()))
+        return self
+
+    def plan(self):
+        """Pick the driving positions and the criteria left to test on each of them."""
+        index = getattr(self.books, "book_index", None)
+        if index is None or not self.criteria:
+            return range(len(self.books)), self.criteria
+        driver = min(self.criteria, key=lambda criterion: index.estimate(*criterion))
+        remaining = [criterion for criterion in self.criteria if criterion is not driver]
+        return index.lookup(*driver), remaining
+
+    def results(self):
+        """Return the books matching every criterion, in collection order."""
+        positions, criteria = self.plan()
+        tests = [_position_test(self.books, criterion, value) for criterion, value in criteria]
+        return [self.books[position] for position in positions if all(test(position) for test in tests)]
+
+    def __iter__(self):
+        return iter(self.results())
+
+def _position_test(books, criterion, value):
+    """Build a predicate over book positions for one query criterion."""
+    if isinstance(books, Catalog):
+        if criterion == "genre":
+            code = books.genre_code(value)
+            return lambda position: books.genre_codes[position] == code
+        if criterion == "available":
+            return lambda position: books.is_available(position) == value
+        if criterion == "decade":
+            return lambda position: books.years[position] // 10 * 10 == value
+        return lambda position: value in books.titles[position].lower() or value in books.author_at(position).lower()
+    if criterion == "genre":
+        return lambda position: books[position]["genre"] == value
+    if criterion == "available":
+        return lambda position: books[position]["available"] == value
+    if criterion == "decade":
+        return lambda position: books[position]["publication_year"] // 10 * 10 == value
+    return lambda position: value in books[position]["title"].lower() or value in books[position]["author"].lower()
+
+def set_engine(engine):
+    """Select the engine ("python" or "numpy") used for bulk operations on a Catalog."""
+    global _engine
+    if engine not in ENGINES:
+        raise ValueError(f"Engine must be one of: {', '.join(ENGINES)}")
+    if engine == "numpy" and np is None:
+        raise ImportError("The numpy engine requires NumPy to be installed")
+    _engine = engine
+
+def get_engine():
+    return _engine
+
+def _numpy_positions(books, criterion, value):
+    """Return the Catalog positions matching a criterion using a boolean mask over its columns."""
+    if criterion == "genre":
+        code = books.genre_code(value)
+        if code is None:
+            return []
+        mask = np.frombuffer(books.genre_codes, dtype=np.uint16) == code
+    elif criterion == "available":
+        bits = np.unpackbits(np.frombuffer(books.available_bits, dtype=np.uint8), count=len(books), bitorder="little")
+        mask = bits.astype(bool) == value
+    elif criterion == "years":
+        years = np.frombuffer(books.years, dtype=np.int16)
+        start, end = value
+        mask = np.ones(len(years), dtype=bool)
+        if start is not None:
+            mask &= years >= start
+        if end is not None:
+            mask &= years <= end
+    else:
+        mask = np.frombuffer(books.years, dtype=np.int16).astype(np.int64) // 10 * 10 == value
+    return np.flatnonzero(mask).tolist()
+
+@_instrumented
+@_cached_query
 def filter_by_genre(books, genre):
     """Filter books by genre using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     if genre is None:
         raise ValueError("Genre cannot be None")
     if not isinstance(genre, str):
         raise TypeError("Genre must be a string")
     
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return [books[position] for position in index.genre(genre)]
+    if isinstance(books, Catalog) and _engine == "numpy":
+        return [books[position] for position in _numpy_positions(books, "genre", genre)]
+    if isinstance(books, Catalog):
+        code = books.genre_code(genre)
+        return [books[position] for position, book_genre in enumerate(books.genre_codes) if book_genre == code]
     return [book for book in books if book["genre"] == genre]
 
+@_instrumented
+@_cached_query
 def filter_by_availability(books, available=True):
     """Filter books by availability using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     if not isinstance(available, bool):
         raise TypeError("Available must be a boolean")
     
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return [books[position] for position in index.availability(available)]
+    if isinstance(books, Catalog) and _engine == "numpy":
+        return [books[position] for position in _numpy_positions(books, "available", available)]
+    if isinstance(books, Catalog):
+        return [books[position] for position, book_available in enumerate(books.availability()) if book_available == available]
     return [book for book in books if book["available"] == available]
 
+@_instrumented
+@_cached_query
 def filter_by_decade(books, decade):
     """Filter books by publication decade using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     if decade is None:
         raise ValueError("Decade cannot be None")
     if not isinstance(decade, int):
         raise TypeError("Decade must be an integer")
     
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return [books[position] for position in index.decade(decade)]
+    if isinstance(books, Catalog) and _engine == "numpy":
+        return [books[position] for position in _numpy_positions(books, "decade", decade)]
+    if isinstance(books, Catalog):
+        return [books[position] for position, year in enumerate(books.years) if year // 10 * 10 == decade]
     return [book for book in books if book["publication_year"] // 10 * 10 == decade]
 
+@_instrumented
+@_cached_query
+def filter_by_year_range(books, start=None, end=None):
+    """Filter books published from start to end inclusive; leave either year as None for an open range."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    for year in (start, end):
+        if year is not None and (not isinstance(year, int) or isinstance(year, bool)):
+            raise TypeError("Years must be integers")
+    if start is not None and end is not None and start > end:
+        raise ValueError("Start year cannot be after end year")
+    
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return [books[position] for position in index.years(start, end)]
+    if isinstance(books, Catalog) and _engine == "numpy":
+        return [books[position] for position in _numpy_positions(books, "years", (start, end))]
+    low = -math.inf if start is None else start
+    high = math.inf if end is None else end
+    if isinstance(books, Catalog):
+        return [books[position] for position, year in enumerate(books.years) if low <= year <= high]
+    return [book for book in books if low <= book["publication_year"] <= high]
+
+@_instrumented
+@_cached_query
 def filter_by_keyword(books, keyword):
     """Filter books by keyword in title or author using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     if keyword is None:
         raise ValueError("Keyword cannot be None")
     if not isinstance(keyword, str):
         raise TypeError("Keyword must be a string")
     
     keyword_lower = keyword.lower()
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return [books[position] for position in index.keyword(keyword_lower)]
+    if isinstance(books, Catalog):
+        return [books[position] for position, (title, author) in enumerate(zip(books.titles, books.authors())) if keyword_lower in title.lower() or keyword_lower in author.lower()]
     return [book for book in books if keyword_lower in book["title"].lower() or keyword_lower in book["author"].lower()]
 
+@_instrumented
 def transform_titles(books, case="upper"):
     """Transform book titles to the specified case using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     if case is None:
         raise ValueError("Case cannot be None")
     if not isinstance(case, str):
         raise TypeError("Case must be a string")
     
+    titles = books.titles if isinstance(books, Catalog) else [book["title"] for book in books]
     if case == "upper":
-        return [book["title"].upper() for book in books]
+        return [title.upper() for title in titles]
     elif case == "lower":
-        return [book["title"].lower() for book in books]
+        return [title.lower() for title in titles]
     elif case == "title":
-        return [book["title"].title() for book in books]
-    return [book["title"] for book in books]
+        return [title.title() for title in titles]
+    return list(titles)
 
+@_instrumented
 def generate_citations(books):
     """Generate formatted citations for books using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     
+    if isinstance(books, Catalog):
+        return [f"{author} ({year}). {title}." for title, author, year in zip(books.titles, books.authors(), books.years)]
     return [f"{book['author']} ({book['publication_year']}). {book['title']}." for book in books]
 
+@_instrumented
 def get_book_availability(books):
     """Create a list of book titles with availability indicators using list comprehension with conditionals."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     
+    if isinstance(books, Catalog):
+        return [f"{title} - {'Available' if available else 'On Loan'}" for title, available in zip(books.titles, books.availability())]
     return [f"{book['title']} - {'Available' if book['available'] else 'On Loan'}" for book in books]
 
+def _check_iterable(books):
+    """Validate the books argument of the lazy iter_* variants."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if isinstance(books, (str, dict)) or not hasattr(books, "__iter__"):
+        raise TypeError("Books must be an iterable of books")
+
+def iter_filter_by_genre(books, genre):
+    """Lazily yield books of a genre; accepts any iterable, including another iter_* generator."""
+    _check_iterable(books)
+    if genre is None:
+        raise ValueError("Genre cannot be None")
+    if not isinstance(genre, str):
+        raise TypeError("Genre must be a string")
+    
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return (books[position] for position in index.genre(genre))
+    if isinstance(books, Catalog):
+        code = books.genre_code(genre)
+        return (books[position] for position, book_genre in enumerate(books.genre_codes) if book_genre == code)
+    return (book for book in books if book["genre"] == genre)
+
+def iter_filter_by_availability(books, available=True):
+    """Lazily yield books with the given availability."""
+    _check_iterable(books)
+    if not isinstance(available, bool):
+        raise TypeError("Available must be a boolean")
+    
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return (books[position] for position in index.availability(available))
+    if isinstance(books, Catalog):
+        return (books[position] for position, book_available in enumerate(books.availability()) if book_available == available)
+    return (book for book in books if book["available"] == available)
+
+def iter_filter_by_decade(books, decade):
+    """Lazily yield books published in a decade."""
+    _check_iterable(books)
+    if decade is None:
+        raise ValueError("Decade cannot be None")
+    if not isinstance(decade, int):
+        raise TypeError("Decade must be an integer")
+    
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return (books[position] for position in index.decade(decade))
+    if isinstance(books, Catalog):
+        return (books[position] for position, year in enumerate(books.years) if year // 10 * 10 == decade)
+    return (book for book in books if book["publication_year"] // 10 * 10 == decade)
+
+def iter_filter_by_keyword(books, keyword):
+    """Lazily yield books whose title or author contains a keyword."""
+    _check_iterable(books)
+    if keyword is None:
+        raise ValueError("Keyword cannot be None")
+    if not isinstance(keyword, str):
+        raise TypeError("Keyword must be a string")
+    
+    keyword_lower = keyword.lower()
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        return (books[position] for position in index.keyword(keyword_lower))
+    if isinstance(books, Catalog):
+        return (books[position] for position, (title, author) in enumerate(zip(books.titles, books.authors())) if keyword_lower in title.lower() or keyword_lower in author.lower())
+    return (book for book in books if keyword_lower in book["title"].lower() or keyword_lower in book["author"].lower())
+
+def iter_transform_titles(books, case="upper"):
+    """Lazily yield book titles in the specified case."""
+    _check_iterable(books)
+    if case is None:
+        raise ValueError("Case cannot be None")
+    if not isinstance(case, str):
+        raise TypeError("Case must be a string")
+    
+    titles = iter(books.titles) if isinstance(books, Catalog) else (book["title"] for book in books)
+    if case == "upper":
+        return (title.upper() for title in titles)
+    elif case == "lower":
+        return (title.lower() for title in titles)
+    elif case == "title":
+        return (title.title() for title in titles)
+    return titles
+
+def iter_citations(books):
+    """Lazily yield formatted citations."""
+    _check_iterable(books)
+    
+    if isinstance(books, Catalog):
+        return (f"{author} ({year}). {title}." for title, author, year in zip(books.titles, books.authors(), books.years))
+    return (f"{book['author']} ({book['publication_year']}). {book['title']}." for book in books)
+
+def iter_book_availability(books):
+    """Lazily yield book titles with availability indicators."""
+    _check_iterable(books)
+    
+    if isinstance(books, Catalog):
+        return (f"{title} - {'Available' if available else 'On Loan'}" for title, available in zip(books.titles, books.availability()))
+    return (f"{book['title']} - {'Available' if book['available'] else 'On Loan'}" for book in books)
+
+@_instrumented
 def calculate_genre_counts(books):
     """Count books in each genre using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     
-    genres = ["fiction", "non-fiction", "reference", "children", "biography"]
-    return {genre: len([book for book in books if book["genre"] == genre]) for genre in genres}
+    if isinstance(books, Catalog) and _engine == "numpy":
+        counts = np.bincount(np.frombuffer(books.genre_codes, dtype=np.uint16), minlength=len(books.genre_table))
+        return {genre: int(counts[books.genre_code(genre)]) for genre in GENRES}
+    if isinstance(books, Catalog):
+        code_counts = Counter(books.genre_codes)
+        return {genre: code_counts[books.genre_code(genre)] for genre in GENRES}
+    return {genre: len([book for book in books if book["genre"] == genre]) for genre in GENRES}
 
+@_instrumented
 def calculate_average_popularity(books):
     """Calculate the average popularity score using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
     
     if not books:
         return 0.0
+    if isinstance(books, Catalog):
+        # Both engines sum the float column left to right with the built-in sum; NumPy's pairwise
+        # summation can differ in the last bit and change the rounded result
+        return round(sum(books.popularity) / len(books), 2)
     return round(sum([book["popularity_score"] for book in books]) / len(books), 2)
 
+@_instrumented
+def aggregate_statistics(books, top_k=3):
+    """Compute genre counts, availability counts, average popularity and the top books in one pass."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    if not isinstance(top_k, int):
+        raise TypeError("Top k must be an integer")
+    if top_k < 0:
+        raise ValueError("Top k cannot be negative")
+    
+    genre_counts = {genre: 0 for genre in GENRES}
+    if isinstance(books, Catalog):
+        # Column scans run inside Counter, sum and int.from_bytes rather than a Python loop
+        code_counts = Counter(books.genre_codes)
+        for genre in GENRES:
+            genre_counts[genre] = code_counts[books.genre_code(genre)]
+        available_count = bin(int.from_bytes(books.available_bits, "little")).count("1")
+        popularity_total = sum(books.popularity)
+        top_positions = heapq.nlargest(top_k, range(len(books)), key=books.popularity.__getitem__)
+    else:
+        available_count = 0
+        popularity_total = 0.0
+        heap = []
+        for position, book in enumerate(books):
+            if book["genre"] in genre_counts:
+                genre_counts[book["genre"]] += 1
+            if book["available"]:
+                available_count += 1
+            popularity_total += book["popularity_score"]
+            # Ties keep the earlier book, matching sorted(..., reverse=True)
+            entry = (book["popularity_score"], -position)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif top_k and entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        top_positions = [-position for score, position in sorted(heap, reverse=True)]
+    
+    return {
+        "total_books": len(books),
+        "available_books": available_count,
+        "on_loan_books": len(books) - available_count,
+        "genre_counts": genre_counts,
+        "average_popularity": round(popularity_total / len(books), 2) if len(books) else 0.0,
+        "top_books": [books[position] for position in top_positions],
+    }
+
+@_instrumented
+def top_popular_books(books, k=3, genre=None, available=None):
+    """Return the k most popular books, optionally restricted to a genre and availability."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    if not isinstance(k, int):
+        raise TypeError("K must be an integer")
+    if k < 0:
+        raise ValueError("K cannot be negative")
+    if genre is not None and not isinstance(genre, str):
+        raise TypeError("Genre must be a string")
+    if available is not None and not isinstance(available, bool):
+        raise TypeError("Available must be a boolean")
+    
+    if genre is None and available is None:
+        live_stats = next((listener for listener in getattr(books, "listeners", ()) if isinstance(listener, LiveStats)), None)
+        if live_stats is not None:
+            return live_stats.top_books(k)
+    
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        positions = range(len(books)) if genre is None else index.genre(genre)
+        if available is not None:
+            matching = set(index.availability(available))
+            positions = [position for position in positions if position in matching]
+    elif isinstance(books, Catalog):
+        code = books.genre_code(genre)
+        positions = [position for position in range(len(books)) if (genre is None or books.genre_codes[position] == code) and (available is None or books.is_available(position) == available)]
+    else:
+        positions = [position for position, book in enumerate(books) if (genre is None or book["genre"] == genre) and (available is None or book["available"] == available)]
+    
+    score = books.popularity.__getitem__ if isinstance(books, Catalog) else lambda position: books[position]["popularity_score"]
+    return [books[position] for position in heapq.nlargest(k, positions, key=score)]
+
+@_instrumented
 def integrate_new_arrivals(books, new_arrivals):
     """Integrate new arrivals into the main collection with section field added using list comprehension."""
     if books is None:
         raise ValueError("Books cannot be None")
     if new_arrivals is None:
         raise ValueError("New arrivals cannot be None")
-    if not isinstance(books, list):
-        raise TypeError("Books must be a list")
-    if not isinstance(new_arrivals, list):
-        raise TypeError("New arrivals must be a list")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    if not isinstance(new_arrivals, BOOK_COLLECTIONS):
+        raise TypeError("New arrivals must be a list or book collection")
+    
+    # Listeners describe one collection, and the input is left as it is, so they cannot follow both
+    if getattr(books, "listeners", ()):
+        raise ValueError("Cannot integrate a collection with subscribed listeners; subscribe the integrated collection instead")
     
-    tagged_new_arrivals = [{**book, "section": "New"} for book in new_arrivals]
-    combined_books = books + tagged_new_arrivals
+    tagged_new_arrivals = [book.with_section("New") if isinstance(book, Book) else {**book, "section": "New"} for book in new_arrivals]
+    # An indexed input keeps its index; the combined collection gets a copy extended with the new rows
+    index = getattr(books, "book_index", None)
+    if isinstance(books, Catalog):
+        combined_books = books.copy()
+        combined_books.book_index = None if index is None else index.copy()
+        combined_books.extend(tagged_new_arrivals)
+        return combined_books
+    combined_books = [*books, *tagged_new_arrivals]
     
     # Remove the duplicate section field from the original books
-    return [{key: value for key, value in book.items() if key != "section"} if "section" not in book else book for book in combined_books]
+    integrated = [(book.copy() if isinstance(book, Book) else {key: value for key, value in book.items() if key != "section"}) if "section" not in book else book for book in combined_books]
+    if isinstance(books, ValidatedBooks):
+        # A validated collection stays validated; only the new arrivals have not been checked yet
+        _require_fields(tagged_new_arrivals)
+        integrated = ValidatedBooks.trusted(integrated)
+    elif index is None:
+        return integrated
+    else:
+        integrated = BookList(integrated)
+    if index is not None:
+        integrated.book_index = index.copy()
+        integrated.book_index.add(tagged_new_arrivals)
+    return integrated
+
+@_instrumented
+def upsert_new_arrivals(books, new_arrivals):
+    """Merge new arrivals keyed on id, inserting unseen ids and updating changed records in place."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if new_arrivals is None:
+        raise ValueError("New arrivals cannot be None")
+    if not isinstance(books, (list, Catalog)):
+        raise TypeError("Books must be a list or Catalog")
+    if not isinstance(new_arrivals, BOOK_COLLECTIONS):
+        raise TypeError("New arrivals must be a list or book collection")
+    
+    # An attached BookIndex keeps an id map up to date; without one only the id column is read,
+    # once, into a plain id map (first occurrence wins, as in the index) instead of building an index
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        find = index.position_of
+    else:
+        ids = list(books.ids) if isinstance(books, Catalog) else list(map(operator.itemgetter("id"), books))
+        id_positions = dict(zip(reversed(ids), range(len(ids) - 1, -1, -1)))
+        find = id_positions.get
+    report = {"inserted": 0, "updated": 0, "skipped": 0}
+    for book in new_arrivals:
+        position = find(book["id"])
+        if position is None:
+            if index is None:
+                id_positions[book["id"]] = len(books)
+            books.append(_with_section(book, "New"))
+            report["inserted"] += 1
+            continue
+        existing = books[position]
+        # Sections are not compared, so a feed repeating a catalog book leaves it where it is
+        if _without_section(existing) == _without_section(book):
+            report["skipped"] += 1
+            continue
+        # Item assignment updates the index and notifies listeners; the record keeps its section
+        books[position] = _with_section(book, existing.get("section"))
+        report["updated"] += 1
+    return books, report
+
+def _without_section(book):
+    return {key: value for key, value in book.items() if key != "section"}
+
+def _with_section(book, section):
+    """Return a copy of a record placed in a section, or in none when section is None."""
+    if isinstance(book, Book):
+        return book.with_section(section)
+    book = _without_section(book)
+    if section is not None:
+        book["section"] = section
+    return book
+
+def integrate_new_arrivals_view(books, new_arrivals):
+    """Integrate new arrivals as a chained view: no rows are copied and "section" is derived per row."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if new_arrivals is None:
+        raise ValueError("New arrivals cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    if not isinstance(new_arrivals, BOOK_COLLECTIONS):
+        raise TypeError("New arrivals must be a list or book collection")
+    
+    # The view shares storage with its inputs, so availability updates reach the original records
+    return ChainedBooks((books, None), (new_arrivals, "New"))
+
+def query(books):
+    """Start a multi-criteria query such as query(books).genre("fiction").available().decade(2010)."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    
+    return BookQuery(books)
+
+def validate_catalog(books, strict=False):
+    """Check every record for the required fields once and return the books as a trusted ValidatedBooks."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    
+    if strict:
+        # Also enforce the full README schema, not just the presence of the fields
+        report = validate_books(books, max_errors=1)
+        if report["errors"]:
+            error = report["errors"][0]
+            raise ValueError(f"Book at position {error['position']} is invalid: {error['errors'][0]['field']}: {error['errors'][0]['message']}")
+    # A Catalog checks the fields of every row it stores
+    if isinstance(books, (Catalog, ValidatedBooks)):
+        return books
+    validated = ValidatedBooks(books)
+    validated.book_index = getattr(books, "book_index", None)
+    validated.listeners = getattr(books, "listeners", ())
+    return validated
+
+def build_index(books):
+    """Attach a BookIndex to the books so genre, availability, decade and keyword filters become lookups."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    
+    if not isinstance(books, (BookList, Catalog)):
+        books = BookList(books)
+    books.book_index = BookIndex(books)
+    return books
+
+def subscribe(books, listener):
+    """Register a listener (such as LiveStats) for add, availability and removal events on the books."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    
+    if not isinstance(books, (BookList, Catalog)):
+        books = BookList(books)
+    books.listeners = [*books.listeners, listener]
+    return books
+
+def _find_position(books, book_id):
+    """Return the position of the first book with the given id."""
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        position = index.position_of(book_id)
+    else:
+        ids = books.ids if isinstance(books, Catalog) else [book["id"] for book in books]
+        position = next((position for position, current_id in enumerate(ids) if current_id == book_id), None)
+    if position is None:
+        raise ValueError(f"Book not found: {book_id}")
+    return position
 
-def get_formatted_book(book):
-    """Format a book for display."""
+@_instrumented
+def update_availability(books, book_id, available):
+    """Set a book's availability flag and keep any attached index and listeners up to date."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    if not isinstance(available, bool):
+        raise TypeError("Available must be a boolean")
+    
+    position = _find_position(books, book_id)
+    if isinstance(books, ChainedBooks):
+        # A Catalog segment hands out copies, so the update goes to the collection holding the book
+        segment, offset = books._locate(position)
+        update_availability(books.segments[segment][0], book_id, available)
+        return books[position]
+    if books[position]["available"] == available:
+        return books[position]
+    if isinstance(books, Catalog):
+        books.set_available(position, available)
+    else:
+        books[position]["available"] = available
+    index = getattr(books, "book_index", None)
+    if index is not None:
+        index.set_available(position, available)
+    _notify(books, "on_availability", books[position], available)
+    return books[position]
+
+@_instrumented
+def remove_book(books, book_id):
+    """Remove a book by id and return it, keeping any attached index and listeners up to date."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    
+    # BookList and Catalog update an attached index and notify listeners when a row is popped
+    return books.pop(_find_position(books, book_id))
+
+def save_catalog(books, path):
+    """Write books to a binary catalog file (fixed-width columns plus a string heap) and return the row count."""
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    
+    catalog = books if isinstance(books, Catalog) else Catalog(books)
+    heap = bytearray()
+    string_offsets = {}
+    for name, strings in [("id_offsets", catalog.ids), ("title_offsets", catalog.titles), ("author_offsets", catalog.author_table), ("genre_offsets", catalog.genre_table)]:
+        offsets = array("Q", [len(heap)])
+        for text in strings:
+            heap += text.encode("utf-8")
+            offsets.append(len(heap))
+        string_offsets[name] = offsets
+    extras = json.dumps({str(position): extra for position, extra in catalog.extras.items()}).encode("utf-8") if catalog.extras else b""
+    sections = {
+        **string_offsets,
+        "popularity": memoryview(catalog.popularity),
+        "author_codes": memoryview(catalog.author_codes),
+        "genre_codes": memoryview(catalog.genre_codes),
+        "years": memoryview(catalog.years),
+        "available_bits": memoryview(catalog.available_bits),
+        "heap": heap,
+        "extras": extras,
+    }
+    
+    count, author_count, genre_count = len(catalog), len(catalog.author_table), len(catalog.genre_table)
+    with open(path, "wb") as catalog_file:
+        catalog_file.write(_CATALOG_HEADER.pack(CATALOG_MAGIC, sys.byteorder[0].encode(), CATALOG_VERSION, count, author_count, genre_count, len(heap), len(extras)))
+        offset = _CATALOG_HEADER.size
+        for name, typecode, length in _catalog_layout(count, author_count, genre_count, len(heap), len(extras)):
+            catalog_file.write(b"\0" * (_align(offset) - offset))
+            data = memoryview(sections[name]).cast("B")
+            catalog_file.write(data)
+            offset = _align(offset) + len(data)
+    return count
+
+def load_catalog(path):
+    """Memory-map a binary catalog file written by save_catalog()."""
+    if path is None:
+        raise ValueError("Path cannot be None")
+    
+    return MappedCatalog(path)
+
+def _fork_context():
+    """Return the fork start method's context, or None on platforms without it."""
+    try:
+        return multiprocessing.get_context("fork")
+    except ValueError:
+        return None
+
+SHARD_CRITERIA = {"filter_by_genre": "genre", "filter_by_availability": "available", "filter_by_decade": "decade", "filter_by_keyword": "keyword"}
+SHARD_AGGREGATES = ["calculate_genre_counts", "calculate_average_popularity"]
+
+_shard_books = None
+
+def _share_shard_books(books):
+    """Pool initializer: map a binary catalog file once per worker, or keep the collection a forked worker inherits."""
+    global _shard_books
+    _shard_books = load_catalog(books) if isinstance(books, str) else books
+
+def _run_shard(name, args, start, stop):
+    """Run one operation over positions start..stop of the worker's collection and return its partial result."""
+    books = _shard_books
+    if name == "calculate_genre_counts":
+        if isinstance(books, Catalog):
+            # Slicing a mapped column is zero-copy
+            code_counts = Counter(books.genre_codes[start:stop])
+            return {books.genre_table[code]: count for code, count in code_counts.items()}
+        return dict(Counter(books[position]["genre"] for position in range(start, stop)))
+    if name == "calculate_average_popularity":
+        if isinstance(books, Catalog):
+            return sum(books.popularity[start:stop]), stop - start
+        return sum(books[position]["popularity_score"] for position in range(start, stop)), stop - start
+    criterion = SHARD_CRITERIA[name]
+    value = args[0] if args else True
+    test = _position_test(books, criterion, value.lower() if criterion == "keyword" else value)
+    return [position for position in range(start, stop) if test(position)]
+
+def run_sharded(function, books, *args, processes=None, shards=None):
+    """Run a filter_by_* function, calculate_genre_counts or calculate_average_popularity over shards on a process pool."""
+    name = getattr(function, "__name__", None)
+    if name not in SHARD_CRITERIA and name not in SHARD_AGGREGATES:
+        raise ValueError(f"Function must be one of: {', '.join([*SHARD_CRITERIA, *SHARD_AGGREGATES])}")
+    if books is None:
+        raise ValueError("Books cannot be None")
+    if not isinstance(books, BOOK_COLLECTIONS):
+        raise TypeError("Books must be a list or book collection")
+    if processes is not None and (not isinstance(processes, int) or processes < 1):
+        raise ValueError("Processes must be a positive integer")
+    if shards is not None and (not isinstance(shards, int) or shards < 1):
+        raise ValueError("Shards must be a positive integer")
+    # The serial function validates the arguments without scanning anything
+    function([], *args)
+    
+    processes = processes or os.cpu_count() or 1
+    shards = shards or processes
+    size = -(-len(books) // shards) or 1
+    bounds = [(start, min(start + size, len(books))) for start in range(0, len(books), size)]
+    
+    # An unchanged MappedCatalog is mapped again from its file by each worker. Any other collection
+    # is inherited by forked workers, or where fork is unavailable (initargs would be pickled to
+    # every worker) written once to a temporary binary catalog that the workers map instead
+    context = _fork_context()
+    snapshot = None
+    if isinstance(books, MappedCatalog) and not books.modified:
+        shared = books.path
+    elif context is not None:
+        shared = books
+    else:
+        descriptor, snapshot = tempfile.mkstemp(suffix=".lbmc")
+        os.close(descriptor)
+        save_catalog(books, snapshot)
+        shared = snapshot
+    try:
+        with (context or multiprocessing.get_context()).Pool(processes, _share_shard_books, (shared,)) as pool:
+            partials = pool.starmap(_run_shard, [(name, args, start, stop) for start, stop in bounds])
+    finally:
+        if snapshot is not None:
+            os.remove(snapshot)
+    
+    # starmap keeps shard order, so merged results follow catalog order
+    if name == "calculate_genre_counts":
+        return {genre: sum(partial.get(genre, 0) for partial in partials) for genre in GENRES}
+    if name == "calculate_average_popularity":
+        total = sum(partial[0] for partial in partials)
+        return round(total / len(books), 2) if len(books) else 0.0
+    return [books[position] for partial in partials for position in partial]
+
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+def _convert_csv_row(header, row):
+    """Turn one CSV row of strings into a typed book dictionary."""
+    if len(row) != len(header):
+        raise ValueError(f"Expected {len(header)} columns, got {len(row)}")
+    book = dict(zip(header, row))
+    if book.get("section") == "":
+        del book["section"]
+    if "publication_year" in book:
+        try:
+            book["publication_year"] = int(book["publication_year"])
+        except ValueError:
+            raise ValueError("publication_year must be an integer")
+    if "available" in book:
+        flag = book["available"].strip().lower()
+        if flag not in ("true", "false", "1", "0", "yes", "no"):
+            raise ValueError("available must be a boolean")
+        book["available"] = flag in ("true", "1", "yes")
+    if "popularity_score" in book:
+        try:
+            book["popularity_score"] = float(book["popularity_score"])
+        except ValueError:
+            raise ValueError("popularity_score must be a number")
+    return book
+
+def _parse_rows(file_format, header, numbered_rows):
+    """Parse one chunk of (line number, raw row) pairs and check it with the compiled validator into books and rejects."""
+    parsed, rejects = [], []
+    for line_number, raw in numbered_rows:
+        try:
+            parsed.append((line_number, raw, _convert_csv_row(header, raw) if file_format == "csv" else json.loads(raw)))
+        except ValueError as exc:
+            rejects.append({"line": line_number, "error": str(exc), "row": raw})
+    invalid = set(compile_validator()([book for _, _, book in parsed]))
+    books = []
+    for position, (line_number, raw, book) in enumerate(parsed):
+        if position in invalid:
+            rejects.append({"line": line_number, "error": "; ".join(error["message"] for error in _book_errors(book)), "row": raw})
+        else:
+            books.append(book)
+    rejects.sort(key=operator.itemgetter("line"))
+    return books, rejects
+
+def _read_chunks(import_file, file_format, chunk_size):
+    """Yield the header and then lists of (line number, raw row) pairs of at most chunk_size rows."""
+    if file_format == "csv":
+        reader = csv.reader(import_file)
+        yield next(reader, [])
+        numbered_rows = ((reader.line_num, row) for row in reader if row)
+    else:
+        yield None
+        numbered_rows = ((line_number, line.rstrip("\r\n")) for line_number, line in enumerate(import_file, 1) if line.strip())
+    while True:
+        chunk = list(itertools.islice(numbered_rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_import_books(path, file_format=None, chunk_size=10000, processes=None, rejects=None):
+    """Stream validated books from a CSV or JSON Lines export in chunks, writing bad rows to rejects as JSON lines."""
+    if path is None:
+        raise ValueError("Path cannot be None")
+    if file_format is None:
+        file_format = IMPORT_FORMATS.get(os.path.splitext(str(path))[1].lower())
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError("File format must be 'csv' or 'jsonl'")
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer")
+    
+    return _iter_import(path, file_format, chunk_size, processes, rejects)
+
+def _iter_import(path, file_format, chunk_size, processes, rejects):
+    with open(path, newline="" if file_format == "csv" else None, encoding="utf-8-sig") as import_file:
+        chunks = _read_chunks(import_file, file_format, chunk_size)
+        header = next(chunks)
+        for books, rejected in _parse_chunks(chunks, file_format, header, processes):
+            if rejects is not None:
+                for reject in rejected:
+                    rejects.write(json.dumps(reject) + "\n")
+            yield from books
+
+def _parse_chunks(chunks, file_format, header, processes):
+    """Parse chunks in order, in-process or on a worker pool with a bounded number of chunks in flight."""
+    if not processes:
+        for chunk in chunks:
+            yield _parse_rows(file_format, header, chunk)
+        return
+    # Chunks are passed as task arguments, so any start method works; fork just starts faster
+    with (_fork_context() or multiprocessing.get_context()).Pool(processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(_parse_rows, (file_format, header, chunk)))
+            if len(pending) >= processes * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+def import_books(path, file_format=None, chunk_size=10000, processes=None, rejects=None, columnar=False):
+    """Load a CSV or JSON Lines export into a list of books, or straight into a Catalog when columnar."""
+    books = Catalog() if columnar else []
+    books.extend(iter_import_books(path, file_format, chunk_size, processes, rejects))
+    return books
+
+@functools.lru_cache(maxsize=None)
+def compile_validator(id_pattern=ID_PATTERN, genres=tuple(GENRES)):
+    """Compile the README schema into a checker returning the positions of the invalid rows in a batch."""
+    id_match = re.compile(id_pattern).fullmatch
+    # Matches every id of a batch joined with newlines in one regex call
+    ids_match = re.compile(f"(?:{id_pattern})(?:\n(?:{id_pattern}))*").fullmatch
+    genre_set = frozenset(genres)
+    get_id, get_title, get_author, get_genre, get_year, get_available, get_score = [operator.itemgetter(field) for field in BOOK_FIELDS]
+    
+    def columns_valid(batch):
+        """Check a whole batch column by column; map, set, join and min/max all loop in C."""
+        try:
+            ids = "\n".join(map(get_id, batch))
+            # type() is used rather than isinstance so True is not accepted as a year or a score
+            return (
+                all(map(isinstance, batch, itertools.repeat(BOOK_RECORDS)))
+                and ids.count("\n") == len(batch) - 1 and ids_match(ids) is not None
+                and set(map(type, map(get_title, batch))) <= {str} and set(map(type, map(get_author, batch))) <= {str}
+                and set(map(get_genre, batch)) <= genre_set
+                and set(map(type, map(get_year, batch))) <= {int} and set(map(type, map(get_available, batch))) <= {bool}
+                and set(map(type, map(get_score, batch))) <= {float, int}
+                # Comparisons with NaN are false, so unlike min/max these cannot skip a NaN score
+                and all(map((1.0).__le__, map(get_score, batch))) and all(map((5.0).__ge__, map(get_score, batch)))
+            )
+        except (KeyError, TypeError, ValueError):
+            return False
+    
+    def row_valid(book):
+        return (
+            isinstance(book, BOOK_RECORDS) and REQUIRED_FIELDS.issubset(book)
+            and type(book["id"]) is str and id_match(book["id"]) is not None
+            and type(book["title"]) is str and type(book["author"]) is str
+            and type(book["genre"]) is str and book["genre"] in genre_set
+            and type(book["publication_year"]) is int
+            and type(book["available"]) is bool
+            and type(book["popularity_score"]) in (float, int) and 1.0 <= book["popularity_score"] <= 5.0
+        )
+    
+    def invalid_positions(books, offset=0, batch_size=VALIDATION_BATCH):
+        """Return offset-based positions of invalid rows; only batches failing the column check are walked row by row."""
+        books = iter(books)
+        invalid = []
+        while True:
+            batch = list(itertools.islice(books, batch_size))
+            if not batch:
+                return invalid
+            if not columns_valid(batch):
+                invalid.extend(offset + position for position, book in enumerate(batch) if not row_valid(book))
+            offset += len(batch)
+    return invalid_positions
+
+def _book_errors(book, id_pattern=ID_PATTERN, genres=tuple(GENRES)):
+    """List every schema violation of one book as {"field", "message"} entries."""
+    if not isinstance(book, BOOK_RECORDS):
+        return [{"field": None, "message": "Book must be a dictionary or book record"}]
+    errors = [{"field": field, "message": f"Book is missing required field: {field}"} for field in BOOK_FIELDS if field not in book]
+    checks = [
+        ("id", lambda value: isinstance(value, str) and re.fullmatch(id_pattern, value) is not None, f"id must be a string matching {id_pattern}"),
+        ("title", lambda value: isinstance(value, str), "title must be a string"),
+        ("author", lambda value: isinstance(value, str), "author must be a string"),
+        ("genre", lambda value: isinstance(value, str) and value in genres, f"genre must be one of: {', '.join(genres)}"),
+        ("publication_year", lambda value: isinstance(value, int) and not isinstance(value, bool), "publication_year must be an integer"),
+        ("available", lambda value: isinstance(value, bool), "available must be a boolean"),
+        ("popularity_score", lambda value: isinstance(value, (int, float)) and not isinstance(value, bool) and 1.0 <= value <= 5.0, "popularity_score must be a number between 1.0 and 5.0"),
+    ]
+    errors.extend({"field": field, "message": message} for field, test, message in checks if field in book and not test(book[field]))
+    return errors
+
+_validation_books = None
+
+def _share_validation_books(books):
+    """Pool initializer: a forked worker inherits the books instead of unpickling them."""
+    global _validation_books
+    _validation_books = books
+
+def _range_rows(books, start, stop):
+    return books[start:stop] if isinstance(books, list) else [books[position] for position in range(start, stop)]
+
+def _invalid_range(start, stop, id_pattern, genres, rows=None):
+    """Pool worker: run the compiled checker (compiled once per worker) over rows start..stop, passed in or inherited."""
+    if rows is None:
+        rows = _range_rows(_validation_books, start, stop)
+    return compile_validator(id_pattern, genres)(rows, start)
+
+def validate_books(books, id_pattern=ID_PATTERN, processes=None, chunk_size=100000, max_errors=1000):
+    """Check books against the README schema with a compiled checker and return an error report instead of raising."""
+    _check_iterable(books)
+    if not isinstance(chunk_size, int) or chunk_size < 1:
+        raise ValueError("Chunk size must be a positive integer")
+    if not isinstance(max_errors, int) or max_errors < 0:
+        raise ValueError("Max errors cannot be negative")
+    
+    genres = tuple(GENRES)
+    books = books if isinstance(books, (list, Catalog, ChainedBooks)) else list(books)
+    if processes:
+        ranges = [(start, min(start + chunk_size, len(books)), id_pattern, genres) for start in range(0, len(books), chunk_size)]
+        context = _fork_context()
+        if context is not None:
+            # Forked workers inherit the books, so only row ranges and invalid positions cross the process boundary
+            pool = context.Pool(processes, _share_validation_books, (books,))
+        else:
+            # Otherwise each chunk is pickled once, to one worker, rather than the whole collection to every worker
+            pool = multiprocessing.get_context().Pool(processes)
+            ranges = [(start, stop, *rest, _range_rows(books, start, stop)) for start, stop, *rest in ranges]
+        with pool:
+            invalid = [position for positions in pool.starmap(_invalid_range, ranges) for position in positions]
+    else:
+        invalid = compile_validator(id_pattern, genres)(books)
+    
+    # Only the invalid rows are examined again to describe what is wrong with them
+    errors = []
+    for position in invalid[:max_errors]:
+        book = books[position]
+        book_id = book.get("id") if isinstance(book, BOOK_RECORDS) else None
+        errors.append({"position": position, "id": book_id, "errors": _book_errors(book, id_pattern, genres)})
+    return {
+        "total": len(books),
+        "valid": len(books) - len(invalid),
+        "invalid": len(invalid),
+        "errors": errors,
+        "truncated": len(invalid) > max_errors,
+    }
+
+EXPORT_REPORTS = {"citations": "citation", "availability": "availability", "books": "row"}
+EXPORT_FORMATS = ["text", "csv", "jsonl"]
+
+def _report_lines(books, report):
+    """Yield (book id, report line) pairs for a report, one book at a time."""
+    if isinstance(books, Catalog):
+        ids, source = iter(books.ids), books
+    else:
+        # tee advances both copies in lockstep, so only one book is ever buffered
+        id_books, source = itertools.tee(books)
+        ids = (book["id"] for book in id_books)
+    if report == "citations":
+        lines = iter_citations(source)
+    elif report == "availability":
+        lines = iter_book_availability(source)
+    elif isinstance(books, (Catalog, ValidatedBooks)):
+        lines = (_format_book(book) for book in source)
+    else:
+        lines = (get_formatted_book(book) for book in source)
+    return zip(ids, lines)
+
+def export_report(books, report, destination=None, file_format="text", batch_size=1000):
+    """Stream citations, availability lines or formatted books to a path, file or stdout in batched writes."""
+    _check_iterable(books)
+    if report not in EXPORT_REPORTS:
+        raise ValueError(f"Report must be one of: {', '.join(EXPORT_REPORTS)}")
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"File format must be one of: {', '.join(EXPORT_FORMATS)}")
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("Batch size must be a positive integer")
+    
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "w", newline="" if file_format == "csv" else None, encoding="utf-8") as export_file:
+            return export_report(books, report, export_file, file_format, batch_size)
+    output = sys.stdout if destination is None else destination
+    column = EXPORT_REPORTS[report]
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if file_format == "csv":
+        writer.writerow(["id", column])
+    count = 0
+    for book_id, line in _report_lines(books, report):
+        if file_format == "text":
+            buffer.write(line + "\n")
+        elif file_format == "csv":
+            writer.writerow([book_id, line])
+        else:
+            buffer.write(json.dumps({"id": book_id, column: line}) + "\n")
+        count += 1
+        if count % batch_size == 0:
+            output.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+    output.write(buffer.getvalue())
+    return count
+
+@_instrumented
+def get_formatted_book(book, cache=None):
+    """Format a book for display, reusing the row from a FormatCache when one is given."""
     if book is None:
         raise ValueError("Book cannot be None")
-    if not isinstance(book, dict):
-        raise TypeError("Book must be a dictionary")
+    if not isinstance(book, BOOK_RECORDS):
+        raise TypeError("Book must be a dictionary or book record")
+    
+    if cache is not None:
+        return cache.format(book)
     
     # Check required fields
     required_fields = ["id", "title", "author", "genre", "publication_year", "available", "popularity_score"]
@@ -159,48 +2336,212 @@ def get_formatted_book(book):
         if field not in book:
             raise ValueError(f"Book is missing required field: {field}")
     
+    return _format_book(book)
+
+def _format_book(book):
+    """Format a record already known to have every required field."""
     availability = "Available" if book["available"] else "On Loan"
     stars = "★" * int(book["popularity_score"]) + "☆" * (5 - int(book["popularity_score"]))
     section = f" [{book['section']}]" if "section" in book else ""
     
     return f"{book['id']} | {book['title']}{section} | {book['author']} | {book['genre']} | {book['publication_year']} | {availability} | Rating: {stars}"
 
-def display_data(data, data_type="books"):
-    """Display formatted books or other data."""
+@_instrumented
+def display_data(data, data_type="books", page=1, page_size=None, cache=None):
+    """Display formatted books or other data, optionally one page at a time; returns the page count when known."""
     if data is None:
         raise ValueError("Data cannot be None")
+    if page_size is not None and (not isinstance(page_size, int) or page_size < 1):
+        raise ValueError("Page size must be a positive integer")
+    if not isinstance(page, int) or page < 1:
+        raise ValueError("Page must be a positive integer")
+    
+    # Lines are collected and written in batches; a page is always a single write
+    output = sys.stdout
+    if data_type == "statistics":
+        output.write("\nLibrary Statistics:\n" + "".join(f"{key}: {value}\n" for key, value in data.items()))
+        return 1
+    if data_type not in ("books", "results", "titles", "citations", "availability"):
+        output.write(f"\nUnknown data type: {data_type}\n{data}\n")
+        return 1
+    
+    start = (page - 1) * page_size if page_size else 0
+    if page_size is None:
+        items = data
+    elif hasattr(data, "__getitem__") and hasattr(data, "__len__"):
+        # Only the visible slice is fetched and formatted
+        items = (data[position] for position in range(start, min(start + page_size, len(data))))
+    else:
+        items = itertools.islice(data, start, start + page_size)
+    pages = max(1, -(-len(data) // page_size)) if page_size and hasattr(data, "__len__") else None
     
     if data_type == "books":
-        print("\nCurrent Book Collection:")
-        for book in data:
-            print(get_formatted_book(book))
+        lines = ["\nCurrent Book Collection:"]
     elif data_type == "results":
-        print("\nFiltered Results:")
-        if data:
-            for book in data:
-                print(get_formatted_book(book))
-        else:
-            print("No books match the criteria.")
-    elif data_type == "titles" or data_type == "citations" or data_type == "availability":
-        print(f"\n{data_type.title()}:")
-        for i, item in enumerate(data):
-            print(f"{i+1}. {item}")
-    elif data_type == "statistics":
-        print("\nLibrary Statistics:")
-        for key, value in data.items():
-            print(f"{key}: {value}")
+        lines = ["\nFiltered Results:"]
     else:
-        print(f"\nUnknown data type: {data_type}")
-        print(data)
+        lines = [f"\n{data_type.title()}:"]
+    # Iterate rather than test truthiness so lazy iter_* generators are consumed one item at a time
+    trusted = isinstance(data, (Catalog, ValidatedBooks))
+    shown = 0
+    for number, item in enumerate(items, start + 1):
+        shown += 1
+        if data_type in ("books", "results") and cache is not None:
+            lines.append(get_formatted_book(item, cache))
+        elif data_type in ("books", "results"):
+            # Rows of a Catalog or ValidatedBooks were checked at ingest
+            lines.append(_format_book(item) if trusted else get_formatted_book(item))
+        else:
+            lines.append(f"{number}. {item}")
+        if page_size is None and len(lines) >= DISPLAY_BATCH:
+            output.write("\n".join(lines) + "\n")
+            lines = []
+    if data_type == "results" and not shown and start == 0:
+        lines.append("No books match the criteria.")
+    if pages is not None and pages > 1:
+        lines.append(f"Page {page} of {pages}")
+    output.write("\n".join(lines) + "\n" if lines else "")
+    return pages
+
+def browse_data(data, data_type="books", page_size=PAGE_SIZE, cache=None):
+    """Show data a page at a time, prompting for next/previous while there is more than one page."""
+    page = 1
+    while True:
+        pages = display_data(data, data_type, page, page_size, cache)
+        if not pages or pages <= 1:
+            return
+        choice = input(f"[n]ext, [p]revious or [q]uit (page {page}/{pages}): ").strip().lower()
+        if choice == "n" and page < pages:
+            page += 1
+        elif choice == "p" and page > 1:
+            page -= 1
+        elif choice == "q":
+            return
+
+SERVICE_OPERATIONS = [
+    "filter_by_genre", "filter_by_availability", "filter_by_decade", "filter_by_year_range", "filter_by_keyword",
+    "transform_titles", "generate_citations", "get_book_availability",
+    "calculate_genre_counts", "calculate_average_popularity", "aggregate_statistics",
+]
+
+def _json_record(record):
+    """json.dumps fallback for Book and SectionedBook records."""
+    if isinstance(record, BOOK_RECORDS):
+        return dict(record.items())
+    raise TypeError(f"Object of type {type(record).__name__} is not JSON serializable")
+
+class LibraryService:
+    """Asyncio front end that runs the list functions on an executor and coalesces identical concurrent calls."""
+
+    def __init__(self, books, executor=None):
+        if books is None:
+            raise ValueError("Books cannot be None")
+        if not isinstance(books, BOOK_COLLECTIONS):
+            raise TypeError("Books must be a list or book collection")
+        self.books = books
+        self.executor = executor
+        self.calls = 0
+        self.coalesced = 0
+        self._pending = {}
+
+    async def call(self, operation, *args):
+        """Run a list function on the books off the event loop, joining an identical call already in flight."""
+        if operation not in SERVICE_OPERATIONS:
+            raise ValueError(f"Operation must be one of: {', '.join(SERVICE_OPERATIONS)}")
+        key = (operation, _typed_args(args))
+        try:
+            pending = self._pending.get(key)
+        except TypeError:
+            key, pending = None, None
+        if pending is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            function = functools.partial(globals()[operation], self.books, *args)
+            pending = asyncio.get_running_loop().run_in_executor(self.executor, function)
+            if key is not None:
+                self._pending[key] = pending
+                pending.add_done_callback(lambda future: self._pending.pop(key, None))
+        # Shielded so one cancelled caller does not cancel the call for the others
+        result = await asyncio.shield(pending)
+        return list(result) if isinstance(result, list) else result
+
+    async def filter_by_genre(self, genre):
+        return await self.call("filter_by_genre", genre)
+
+    async def filter_by_availability(self, available=True):
+        return await self.call("filter_by_availability", available)
+
+    async def filter_by_decade(self, decade):
+        return await self.call("filter_by_decade", decade)
+
+    async def filter_by_year_range(self, start=None, end=None):
+        return await self.call("filter_by_year_range", start, end)
+
+    async def filter_by_keyword(self, keyword):
+        return await self.call("filter_by_keyword", keyword)
+
+    async def transform_titles(self, case="upper"):
+        return await self.call("transform_titles", case)
+
+    async def generate_citations(self):
+        return await self.call("generate_citations")
+
+    async def get_book_availability(self):
+        return await self.call("get_book_availability")
+
+    async def statistics(self, top_k=3):
+        return await self.call("aggregate_statistics", top_k)
+
+    async def handle_connection(self, reader, writer):
+        """Answer {"operation": ..., "args": [...]} JSON lines with {"result": ...} or {"error": ...} lines."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    result = await self.call(request["operation"], *request.get("args", []))
+                    response = {"result": result}
+                except Exception as exc:
+                    response = {"error": f"{type(exc).__name__}: {exc}"}
+                writer.write((json.dumps(response, default=_json_record) + "\n").encode("utf-8"))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=0):
+        """Start a loopback JSON lines server; port 0 picks a free port, read it from server.sockets."""
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+async def request_service(host, port, operation, *args):
+    """Send one request to a LibraryService server and return its result, raising RuntimeError on an error reply."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write((json.dumps({"operation": operation, "args": list(args)}) + "\n").encode("utf-8"))
+        await writer.drain()
+        response = json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    if "error" in response:
+        raise RuntimeError(response["error"])
+    return response["result"]
 
 def main():
     """Main program function."""
     books, new_arrivals = initialize_data()
-    integrated = False
+    books = build_index(validate_catalog(books))
+    live_stats = LiveStats(books)
+    books = subscribe(books, live_stats)
+    format_cache = FormatCache()
+    books = subscribe(books, format_cache)
+    books = subscribe(books, QueryCache())
     
     while True:
-        total_books = len(books)
-        available_books = len([book for book in books if book["available"]])
+        total_books = live_stats.total_books
+        available_books = live_stats.available_books
         
         print(f"\n===== LIBRARY BOOK MANAGEMENT SYSTEM =====")
         print(f"Total Books: {total_books}")
@@ -220,38 +2561,48 @@ def main():
             break
             
         elif choice == "1":
-            display_data(books, "books")
+            browse_data(books, "books", cache=format_cache)
         
         elif choice == "2":
             print("\n1. Filter by Genre")
             print("2. Filter by Availability")
             print("3. Filter by Decade")
             print("4. Filter by Keyword")
-            filter_option = input("Select filter option (1-4): ")
+            print("5. Filter by Year Range")
+            filter_option = input("Select filter option (1-5): ")
             
             if filter_option == "1":
                 genre = input("Enter genre to filter by (fiction/non-fiction/reference/children/biography): ")
                 filtered = filter_by_genre(books, genre)
-                display_data(filtered, "results")
+                browse_data(filtered, "results", cache=format_cache)
             
             elif filter_option == "2":
                 availability = input("Filter by available or on loan? (available/on_loan): ")
                 is_available = availability == "available"
                 filtered = filter_by_availability(books, is_available)
-                display_data(filtered, "results")
+                browse_data(filtered, "results", cache=format_cache)
             
             elif filter_option == "3":
                 try:
                     decade = int(input("Enter decade to filter by (e.g., 2010 for 2010s): "))
                     filtered = filter_by_decade(books, decade)
-                    display_data(filtered, "results")
+                    browse_data(filtered, "results", cache=format_cache)
                 except ValueError:
                     print("Invalid input. Please enter a number.")
             
             elif filter_option == "4":
                 keyword = input("Enter keyword to search for: ")
                 filtered = filter_by_keyword(books, keyword)
-                display_data(filtered, "results")
+                browse_data(filtered, "results", cache=format_cache)
+            
+            elif filter_option == "5":
+                try:
+                    start = input("Enter first year (blank for no limit): ").strip()
+                    end = input("Enter last year (blank for no limit): ").strip()
+                    filtered = filter_by_year_range(books, int(start) if start else None, int(end) if end else None)
+                    browse_data(filtered, "results", cache=format_cache)
+                except ValueError:
+                    print("Invalid input. Please enter years as numbers, first year not after the last.")
         
         elif choice == "3":
             print("\n1. Transform Titles")
@@ -285,36 +2636,45 @@ def main():
                 display_data(availability_list, "availability")
         
         elif choice == "4":
-            genre_counts = calculate_genre_counts(books)
-            avg_popularity = calculate_average_popularity(books)
+            aggregated = aggregate_statistics(books, 3)
             
             statistics = {
-                "Total books": len(books),
-                "Available books": len([book for book in books if book["available"]]),
-                "Average popularity": f"{avg_popularity}/5.0"
+                "Total books": aggregated["total_books"],
+                "Available books": aggregated["available_books"],
+                "Average popularity": f"{aggregated['average_popularity']}/5.0"
             }
             
-            for genre, count in genre_counts.items():
+            for genre, count in aggregated["genre_counts"].items():
                 statistics[f"{genre.capitalize()} books"] = count
             
             display_data(statistics, "statistics")
             
             # Most popular books (top 3)
-            popular_books = sorted(books, key=lambda book: book["popularity_score"], reverse=True)[:3]
+            popular_books = aggregated["top_books"]
             print("\nMost Popular Books:")
             for i, book in enumerate(popular_books):
                 print(f"{i+1}. {book['title']} ({book['popularity_score']}/5.0)")
         
+        elif choice == "p":
+            # Hidden option: print the live profile when started with --profile
+            profiler = get_profiler()
+            print(profiler.dump() if profiler is not None else "Profiling is off; start the program with --profile.")
+        
         elif choice == "5":
-            if not integrated:
-                books = integrate_new_arrivals(books, new_arrivals)
-                integrated = True
+            books, report = upsert_new_arrivals(books, new_arrivals)
+            if report["inserted"] or report["updated"]:
                 print("New arrivals added to the collection.")
             else:
                 print("New arrivals already integrated.")
+            print(f"Inserted: {report['inserted']}, Updated: {report['updated']}, Skipped: {report['skipped']}")
         
         else:
             print("Invalid choice. Please try again.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--profile" in sys.argv[1:]:
+        with Profiler() as profiler:
+            main()
+        print(profiler.dump())
+    else:
+        main()
\ No newline at end of file
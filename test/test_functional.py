@@ -187,5 +187,828 @@ def test_list_comprehension_integration(test_obj, sample_books, sample_new_arriv
         test_obj.yakshaAssert("TestListComprehensionIntegration", False, "functional")
         pytest.fail(f"List comprehension integration test failed: {str(e)}")
 
+def test_columnar_catalog(test_obj, sample_books, sample_new_arrivals):
+    """Test that the columnar Catalog gives the same results as the list of dictionaries"""
+    try:
+        catalog, new_arrivals_catalog = initialize_data(columnar=True)
+        assert isinstance(catalog, Catalog), "initialize_data(columnar=True) should return a Catalog"
+        assert len(catalog) == len(sample_books), "Catalog should contain every book"
+        assert list(catalog) == sample_books, "Catalog rows should match the original book dictionaries"
+        
+        assert filter_by_genre(catalog, "fiction") == filter_by_genre(sample_books, "fiction"), "Genre filter should match"
+        assert filter_by_availability(catalog, False) == filter_by_availability(sample_books, False), "Availability filter should match"
+        assert filter_by_decade(catalog, 2010) == filter_by_decade(sample_books, 2010), "Decade filter should match"
+        assert filter_by_keyword(catalog, "of") == filter_by_keyword(sample_books, "of"), "Keyword filter should match"
+        assert transform_titles(catalog, "title") == transform_titles(sample_books, "title"), "Title transformation should match"
+        assert generate_citations(catalog) == generate_citations(sample_books), "Citations should match"
+        assert get_book_availability(catalog) == get_book_availability(sample_books), "Availability list should match"
+        assert calculate_genre_counts(catalog) == calculate_genre_counts(sample_books), "Genre counts should match"
+        assert calculate_average_popularity(catalog) == calculate_average_popularity(sample_books), "Average popularity should match"
+        
+        integrated = integrate_new_arrivals(catalog, new_arrivals_catalog)
+        assert list(integrated) == integrate_new_arrivals(sample_books, sample_new_arrivals), "Integrated catalog should match"
+        assert len(catalog) == len(sample_books), "Integration should not modify the original catalog"
+        
+        for bad_book in [{**sample_books[0], "publication_year": "2019"}, {**sample_books[0], "publication_year": 40000}, {**sample_books[0], "popularity_score": "high"}]:
+            with pytest.raises(ValueError):
+                catalog.append(bad_book)
+            with pytest.raises(ValueError):
+                catalog[0] = bad_book
+            assert list(catalog) == sample_books, "A rejected book should leave the catalog unchanged"
+        
+        test_obj.yakshaAssert("TestColumnarCatalog", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestColumnarCatalog", False, "functional")
+        pytest.fail(f"Columnar catalog test failed: {str(e)}")
+
+def test_book_index(test_obj, sample_books, sample_new_arrivals):
+    """Test that indexed filters match the list comprehension filters and stay up to date"""
+    try:
+        for plain_books, new_arrivals in [(sample_books, sample_new_arrivals), initialize_data(columnar=True)]:
+            indexed = build_index(plain_books)
+            assert filter_by_genre(indexed, "reference") == filter_by_genre(list(plain_books), "reference"), "Indexed genre filter should match"
+            assert filter_by_availability(indexed, True) == filter_by_availability(list(plain_books), True), "Indexed availability filter should match"
+            assert filter_by_decade(indexed, 2010) == filter_by_decade(list(plain_books), 2010), "Indexed decade filter should match"
+            
+            integrated = integrate_new_arrivals(indexed, new_arrivals)
+            expected = integrate_new_arrivals(list(plain_books), list(new_arrivals))
+            assert filter_by_genre(integrated, "reference") == filter_by_genre(expected, "reference"), "Index should cover new arrivals"
+            assert filter_by_decade(integrated, 2020) == filter_by_decade(expected, 2020), "Index should cover new arrival decades"
+            
+            update_availability(integrated, "B002", True)
+            assert "B002" in [book["id"] for book in filter_by_availability(integrated, True)], "Index should follow availability changes"
+            assert "B002" not in [book["id"] for book in filter_by_availability(integrated, False)], "Book should leave the on-loan bucket"
+            assert "B002" in [book["id"] for book in filter_by_availability(indexed, False)], "The input should keep its own index"
+            update_availability(indexed, "B001", False)
+            assert "B001" in [book["id"] for book in filter_by_availability(indexed, False)], "Updates through the input should reach its index"
+            assert "B001" in [book["id"] for book in filter_by_availability(integrated, True)], "The integrated index should not change with the input"
+        
+        with pytest.raises(ValueError):
+            update_availability(sample_books, "X999", True)
+        
+        indexed = build_index(list(initialize_data()[0]))
+        indexed += [dict(sample_new_arrivals[0])]
+        indexed.insert(0, dict(sample_new_arrivals[1]))
+        indexed[1] = {**indexed[1], "genre": "fiction"}
+        del indexed[2]
+        index = indexed.book_index
+        indexed.pop()
+        indexed.insert(3, dict(sample_new_arrivals[0], id="N003"))
+        del indexed[0:4:2]
+        assert indexed.book_index is index, "Insertions and removals should update the index in place"
+        for genre in GENRES:
+            assert filter_by_genre(indexed, genre) == filter_by_genre(list(indexed), genre), "Every list mutation should keep the index current"
+        assert filter_by_keyword(indexed, "data") == filter_by_keyword(list(indexed), "data") and filter_by_decade(indexed, 2020) == filter_by_decade(list(indexed), 2020)
+        assert remove_book(indexed, "N003")["id"] == "N003" and filter_by_availability(indexed, True) == filter_by_availability(list(indexed), True)
+        
+        plain_books = initialize_data()[0]
+        catalog = build_index(Catalog(plain_books))
+        remove_book(catalog, "B002")
+        assert list(catalog) == plain_books[:1] + plain_books[2:], "Removing a row should shift the availability bits"
+        assert [book["id"] for book in filter_by_availability(catalog, False)] == ["B005"], "The catalog index should follow removals"
+        with pytest.raises(TypeError):
+            indexed.sort(key=lambda book: book["id"])
+        
+        test_obj.yakshaAssert("TestBookIndex", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestBookIndex", False, "functional")
+        pytest.fail(f"Book index test failed: {str(e)}")
+
+def test_keyword_index(test_obj, sample_books, sample_new_arrivals):
+    """Test that the trigram keyword index returns exactly what the scanning filter returns"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        indexed = build_index(list(books))
+        for keyword in ["", "o", "Py", "python", "OF", "ing", "ohn smi", "midnight", "nightjohn", "zzz"]:
+            assert filter_by_keyword(indexed, keyword) == filter_by_keyword(books, keyword), f"Indexed keyword search should match for '{keyword}'"
+        
+        test_obj.yakshaAssert("TestKeywordIndex", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestKeywordIndex", False, "functional")
+        pytest.fail(f"Keyword index test failed: {str(e)}")
+
+def test_multi_criteria_query(test_obj, sample_books, sample_new_arrivals):
+    """Test that fused queries match chaining the filter functions"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        chained = filter_by_keyword(filter_by_decade(filter_by_availability(filter_by_genre(books, "reference"), True), 2010), "python")
+        for collection in [books, build_index(list(books)), Catalog(books), build_index(Catalog(books))]:
+            assert query(collection).genre("reference").available().decade(2010).keyword("Python").results() == chained, "Query should match chained filters"
+            assert list(query(collection).available(False)) == filter_by_availability(books, False), "Single criterion query should match its filter"
+            assert query(collection).results() == list(books), "Query without criteria should return every book"
+            assert query(collection).genre("fiction").genre("children").results() == [], "Conflicting criteria should return no books"
+        
+        with pytest.raises(TypeError):
+            query(books).decade("2010")
+        
+        test_obj.yakshaAssert("TestMultiCriteriaQuery", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestMultiCriteriaQuery", False, "functional")
+        pytest.fail(f"Multi-criteria query test failed: {str(e)}")
+
+def test_aggregate_statistics(test_obj, sample_books, sample_new_arrivals):
+    """Test that the one-pass aggregator matches the individual statistics functions"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        books.append({**books[0], "id": "B006", "popularity_score": books[0]["popularity_score"]})
+        for collection in [books, Catalog(books)]:
+            stats = aggregate_statistics(collection, 3)
+            assert stats["total_books"] == len(books), "Total should count every book"
+            assert stats["available_books"] == len(filter_by_availability(books, True)), "Available count should match"
+            assert stats["on_loan_books"] == len(filter_by_availability(books, False)), "On loan count should match"
+            assert stats["genre_counts"] == calculate_genre_counts(books), "Genre counts should match"
+            assert stats["average_popularity"] == calculate_average_popularity(books), "Average popularity should match"
+            expected_top = sorted(books, key=lambda book: book["popularity_score"], reverse=True)
+            for k in [0, 1, 3, 4, 20]:
+                assert aggregate_statistics(collection, k)["top_books"] == expected_top[:k], f"Top {k} books should match a full sort"
+        
+        empty_stats = aggregate_statistics([])
+        assert empty_stats["average_popularity"] == 0.0 and empty_stats["top_books"] == [], "Empty collection should aggregate to zeros"
+        
+        test_obj.yakshaAssert("TestAggregateStatistics", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestAggregateStatistics", False, "functional")
+        pytest.fail(f"Aggregate statistics test failed: {str(e)}")
+
+def test_live_statistics(test_obj, sample_books, sample_new_arrivals):
+    """Test that LiveStats follows additions, availability changes and removals"""
+    try:
+        for books, new_arrivals in [(sample_books, sample_new_arrivals), initialize_data(columnar=True)]:
+            books = integrate_new_arrivals(books, new_arrivals)
+            live_stats = LiveStats(books)
+            books = subscribe(build_index(books), live_stats)
+            update_availability(books, "B002", True)
+            update_availability(books, "B002", True)
+            removed = remove_book(books, "B004")
+            assert removed["id"] == "B004", "remove_book should return the removed book"
+            
+            expected = aggregate_statistics(list(books), 3)
+            assert live_stats.total_books == expected["total_books"], "Total should follow mutations"
+            assert live_stats.available_books == expected["available_books"], "Available count should follow mutations"
+            assert live_stats.on_loan_books == expected["on_loan_books"], "On loan count should follow mutations"
+            assert live_stats.genre_counts == expected["genre_counts"], "Genre histogram should follow mutations"
+            assert live_stats.average_popularity == expected["average_popularity"], "Average popularity should follow mutations"
+            assert live_stats.top_books() == expected["top_books"], "Top books should skip removed books"
+            assert [book["available"] for book in live_stats.top_books(7) if book["id"] == "B002"] == [True], "Top books should carry the updated record"
+            assert filter_by_genre(books, "children") == [], "Index should follow removals"
+        assert not sample_books[1]["available"], "Updating the integrated books should not change the original records"
+        with pytest.raises(ValueError):
+            integrate_new_arrivals(subscribe(list(sample_books), LiveStats(sample_books)), sample_new_arrivals)
+        
+        test_obj.yakshaAssert("TestLiveStatistics", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestLiveStatistics", False, "functional")
+        pytest.fail(f"Live statistics test failed: {str(e)}")
+
+def test_top_popular_books(test_obj, sample_books, sample_new_arrivals):
+    """Test that heap-based top-k matches sorting the filtered books"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        for collection in [books, Catalog(books), build_index(list(books)), build_index(Catalog(books)), subscribe(list(books), LiveStats(books))]:
+            for genre in [None, "reference", "fiction", "unknown"]:
+                for available in [None, True, False]:
+                    candidates = books if genre is None else filter_by_genre(books, genre)
+                    candidates = candidates if available is None else filter_by_availability(candidates, available)
+                    expected = sorted(candidates, key=lambda book: book["popularity_score"], reverse=True)
+                    for k in [0, 2, 10]:
+                        assert top_popular_books(collection, k, genre, available) == expected[:k], f"Top {k} for {genre}/{available} should match a full sort"
+        
+        with pytest.raises(ValueError):
+            top_popular_books(books, -1)
+        
+        test_obj.yakshaAssert("TestTopPopularBooks", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestTopPopularBooks", False, "functional")
+        pytest.fail(f"Top popular books test failed: {str(e)}")
+
+def test_streaming_variants(test_obj, sample_books, sample_new_arrivals, capsys):
+    """Test that the lazy iter_* variants compose and match the list functions"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        for collection in [books, Catalog(books), build_index(list(books))]:
+            pipeline = iter_filter_by_keyword(iter_filter_by_decade(iter_filter_by_availability(collection, True), 2020), "a")
+            assert inspect.isgenerator(pipeline), "iter_* functions should return generators"
+            assert list(pipeline) == filter_by_keyword(filter_by_decade(filter_by_availability(books, True), 2020), "a"), "Pipeline should match chained filters"
+            assert list(iter_filter_by_genre(collection, "reference")) == filter_by_genre(books, "reference"), "Genre iterator should match"
+            for case in ["upper", "lower", "title", "other"]:
+                assert list(iter_transform_titles(collection, case)) == transform_titles(books, case), f"Title iterator should match for '{case}'"
+            assert list(iter_citations(collection)) == generate_citations(books), "Citation iterator should match"
+            assert list(iter_book_availability(collection)) == get_book_availability(books), "Availability iterator should match"
+        
+        display_data(iter_filter_by_genre(books, "unknown"), "results")
+        assert "No books match the criteria." in capsys.readouterr().out, "Empty generator should report no matches"
+        
+        with pytest.raises(TypeError):
+            iter_filter_by_genre("not books", "fiction")
+        
+        test_obj.yakshaAssert("TestStreamingVariants", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestStreamingVariants", False, "functional")
+        pytest.fail(f"Streaming variants test failed: {str(e)}")
+
+def test_numpy_engine(test_obj, sample_books, sample_new_arrivals):
+    """Test that the numpy engine returns the same results as the python engine"""
+    pytest.importorskip("numpy")
+    try:
+        catalog = Catalog(integrate_new_arrivals(sample_books, sample_new_arrivals))
+        expected = (
+            filter_by_genre(catalog, "reference"), filter_by_genre(catalog, "unknown"),
+            filter_by_availability(catalog, True), filter_by_availability(catalog, False),
+            filter_by_decade(catalog, 2010), filter_by_decade(catalog, 1900),
+            calculate_genre_counts(catalog), calculate_average_popularity(catalog),
+        )
+        set_engine("numpy")
+        try:
+            assert get_engine() == "numpy", "Engine should switch to numpy"
+            actual = (
+                filter_by_genre(catalog, "reference"), filter_by_genre(catalog, "unknown"),
+                filter_by_availability(catalog, True), filter_by_availability(catalog, False),
+                filter_by_decade(catalog, 2010), filter_by_decade(catalog, 1900),
+                calculate_genre_counts(catalog), calculate_average_popularity(catalog),
+            )
+            assert actual == expected, "Numpy engine results should match the python engine"
+            assert filter_by_genre(Catalog(), "fiction") == [], "Numpy engine should handle an empty catalog"
+        finally:
+            set_engine("python")
+        
+        with pytest.raises(ValueError):
+            set_engine("gpu")
+        
+        test_obj.yakshaAssert("TestNumpyEngine", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestNumpyEngine", False, "functional")
+        pytest.fail(f"Numpy engine test failed: {str(e)}")
+
+def test_book_records(test_obj, sample_books, sample_new_arrivals):
+    """Test that __slots__ Book records work everywhere book dictionaries do"""
+    try:
+        books, new_arrivals = initialize_data(records=True)
+        assert all(isinstance(book, Book) for book in books + new_arrivals), "initialize_data(records=True) should return Book records"
+        assert not hasattr(books[0], "__dict__"), "Book records should not carry a per-instance dictionary"
+        assert books == sample_books, "Book records should compare equal to the original dictionaries"
+        assert books[0]["title"] == books[0].title == "Python Fundamentals", "Book should support key and attribute access"
+        assert "section" not in books[0], "Book without a section should not report a section field"
+        
+        assert filter_by_genre(books, "fiction") == filter_by_genre(sample_books, "fiction"), "Filters should accept Book records"
+        assert filter_by_keyword(books, "smith") == filter_by_keyword(sample_books, "smith"), "Keyword filter should accept Book records"
+        assert generate_citations(books) == generate_citations(sample_books), "Citations should accept Book records"
+        assert calculate_average_popularity(books) == calculate_average_popularity(sample_books), "Statistics should accept Book records"
+        assert [get_formatted_book(book) for book in books] == [get_formatted_book(book) for book in sample_books], "Formatting should accept Book records"
+        
+        integrated = integrate_new_arrivals(books, new_arrivals)
+        assert all(isinstance(book, Book) for book in integrated), "Integration should keep Book records"
+        assert integrated == integrate_new_arrivals(sample_books, sample_new_arrivals), "Integration should match the dictionary version"
+        assert get_formatted_book(integrated[-1]).startswith("N002 | Quantum Physics Simplified [New]"), "New arrivals should show their section"
+        
+        update_availability(integrated, "B002", True)
+        assert integrated[1]["available"] and not books[1]["available"], "Integrated records should be copies"
+        
+        with pytest.raises(KeyError):
+            books[0]["isbn"]
+        
+        test_obj.yakshaAssert("TestBookRecords", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestBookRecords", False, "functional")
+        pytest.fail(f"Book records test failed: {str(e)}")
+
+def test_chained_integration_view(test_obj, sample_books, sample_new_arrivals):
+    """Test that the zero-copy integration view looks the same as the copied integration"""
+    try:
+        expected = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        view = integrate_new_arrivals_view(sample_books, sample_new_arrivals)
+        assert len(view) == len(expected), "View should cover both collections"
+        assert list(view) == expected, "View rows should match the copied integration"
+        assert view[-1]["section"] == "New" and "section" not in view[0], "Only new arrivals should expose a section"
+        assert view[0] is sample_books[0], "Original books should not be copied"
+        assert "section" not in sample_new_arrivals[0], "New arrival records should not be modified"
+        
+        assert filter_by_genre(view, "reference") == filter_by_genre(expected, "reference"), "Filters should accept the view"
+        assert filter_by_keyword(view, "data") == filter_by_keyword(expected, "data"), "Keyword filter should accept the view"
+        assert generate_citations(view) == generate_citations(expected), "Citations should accept the view"
+        assert aggregate_statistics(view) == aggregate_statistics(expected), "Statistics should accept the view"
+        assert [get_formatted_book(book) for book in view] == [get_formatted_book(book) for book in expected], "Formatting should match"
+        assert list(integrate_new_arrivals_view(view, [])) == expected, "Views should chain"
+        
+        update_availability(view, "N001", False)
+        assert sample_new_arrivals[0]["available"] is False, "Updates through the view should reach the original record"
+        
+        books, new_arrivals = initialize_data(columnar=True)
+        catalog_view = integrate_new_arrivals_view(build_index(books), new_arrivals)
+        updated = update_availability(catalog_view, "B002", True)
+        assert updated["available"] is True and books[1]["available"] is True, "Updates should reach Catalog segments"
+        assert [book["id"] for book in filter_by_availability(books, False)] == ["B005"], "The segment's index should follow the update"
+        assert update_availability(catalog_view, "N002", False)["section"] == "New", "Updated new arrivals should keep their section"
+        assert new_arrivals[1]["available"] is False
+        
+        test_obj.yakshaAssert("TestChainedIntegrationView", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestChainedIntegrationView", False, "functional")
+        pytest.fail(f"Chained integration view test failed: {str(e)}")
+
+def test_upsert_new_arrivals(test_obj, sample_books, sample_new_arrivals):
+    """Test that repeated upserts keyed on id never duplicate books"""
+    try:
+        expected = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        for books, new_arrivals in [initialize_data(), initialize_data(columnar=True), initialize_data(records=True)]:
+            live_stats = LiveStats(books)
+            books = subscribe(books, live_stats)
+            books, report = upsert_new_arrivals(books, new_arrivals)
+            assert report == {"inserted": 2, "updated": 0, "skipped": 0}, "First run should insert every arrival"
+            assert list(books) == expected, "First run should match integrate_new_arrivals"
+            
+            books, report = upsert_new_arrivals(books, new_arrivals)
+            assert report == {"inserted": 0, "updated": 0, "skipped": 2}, "Re-running the feed should skip every arrival"
+            assert len(books) == len(expected), "Re-running the feed should not add duplicates"
+            
+            changed = [{**sample_new_arrivals[0], "genre": "fiction", "title": "Data Science Stories", "popularity_score": 5.0}, {**sample_books[1], "available": True}]
+            books, report = upsert_new_arrivals(books, changed)
+            assert report == {"inserted": 0, "updated": 2, "skipped": 0}, "Changed records should be updated"
+            assert [book["id"] for book in filter_by_genre(books, "fiction")] == ["B002", "N001"], "Index should follow updated genres"
+            assert [book["id"] for book in filter_by_keyword(books, "stories")] == ["N001"], "Keyword index should follow updated titles"
+            assert filter_by_keyword(books, "handbook") == [], "Old title should leave the keyword index"
+            assert live_stats.top_books(1)[0]["id"] == "N001", "Live statistics should follow updates"
+            assert live_stats.genre_counts == calculate_genre_counts(list(books)), "Live genre counts should follow updates"
+            assert live_stats.available_books == len(filter_by_availability(list(books), True)), "Live availability should follow updates"
+            
+            books, report = upsert_new_arrivals(books, [sample_books[2], {**sample_books[3], "available": False}])
+            assert report == {"inserted": 0, "updated": 1, "skipped": 1}, "Catalog books repeated in the feed should be skipped when unchanged"
+            assert "section" not in books[2] and "section" not in books[3], "Catalog books should not be re-tagged as new arrivals"
+        
+        test_obj.yakshaAssert("TestUpsertNewArrivals", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestUpsertNewArrivals", False, "functional")
+        pytest.fail(f"Upsert new arrivals test failed: {str(e)}")
+
+def test_binary_catalog_file(test_obj, sample_books, sample_new_arrivals, tmp_path):
+    """Test that a saved binary catalog memory-maps back to the same books"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        path = tmp_path / "catalog.lbmc"
+        assert save_catalog(books, str(path)) == len(books), "save_catalog should report the row count"
+        
+        mapped = load_catalog(str(path))
+        assert isinstance(mapped, Catalog), "A mapped catalog should be usable wherever a Catalog is"
+        assert list(mapped) == books, "Mapped rows should match the saved books"
+        assert filter_by_genre(mapped, "reference") == filter_by_genre(books, "reference"), "Genre filter should run on the mapped file"
+        assert filter_by_keyword(mapped, "sim") == filter_by_keyword(books, "sim"), "Keyword filter should run on the mapped file"
+        assert filter_by_decade(mapped, 2010) == filter_by_decade(books, 2010), "Decade filter should run on the mapped file"
+        assert generate_citations(mapped) == generate_citations(books), "Citations should run on the mapped file"
+        assert aggregate_statistics(mapped) == aggregate_statistics(books), "Statistics should run on the mapped file"
+        
+        update_availability(mapped, "B002", True)
+        assert mapped[1]["available"], "Availability should change in memory"
+        assert not load_catalog(str(path))[1]["available"], "Availability changes should not be written to the file"
+        with pytest.raises(TypeError):
+            mapped.append(books[0])
+        
+        save_catalog(books, str(path))
+        path.write_bytes(path.read_bytes()[:-40])
+        with pytest.raises(ValueError):
+            load_catalog(str(path))
+        
+        save_catalog([], str(path))
+        assert list(load_catalog(str(path))) == [], "An empty catalog should round-trip"
+        
+        path.write_bytes(b"not a catalog file at all, just some text padding")
+        with pytest.raises(ValueError):
+            load_catalog(str(path))
+        
+        test_obj.yakshaAssert("TestBinaryCatalogFile", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestBinaryCatalogFile", False, "functional")
+        pytest.fail(f"Binary catalog file test failed: {str(e)}")
+
+def test_streaming_import(test_obj, sample_books, tmp_path):
+    """Test that CSV and JSON Lines exports import in chunks with bad rows rejected"""
+    try:
+        import io
+        import json
+        import csv as csv_module
+        csv_path = tmp_path / "books.csv"
+        with open(csv_path, "w", newline="") as csv_file:
+            writer = csv_module.writer(csv_file)
+            writer.writerow(BOOK_FIELDS)
+            for book in sample_books:
+                writer.writerow([book[field] for field in BOOK_FIELDS])
+            writer.writerow(["X001", "Bad Genre", "Nobody", "poetry", 2001, True, 3.0])
+            writer.writerow(["X002", "Bad Score", "Nobody", "fiction", 2001, True, 9.5])
+            writer.writerow(["X003", "Bad Flag", "Nobody", "fiction", 2001, "maybe", 3.0])
+        jsonl_path = tmp_path / "books.jsonl"
+        jsonl_path.write_text("\n".join([json.dumps(book) for book in sample_books] + ['{"id": "X004"}', "not json", '{"id": "X005", "title": "T", "author": "A", "genre": "fiction", "publication_year": 2001, "available": "yes", "popularity_score": 3.0}']) + "\n")
+        
+        for path in [csv_path, jsonl_path]:
+            for processes in [None, 2]:
+                rejects = io.StringIO()
+                books = import_books(str(path), chunk_size=2, processes=processes, rejects=rejects)
+                assert books == sample_books, f"Valid rows from {path.name} should import unchanged"
+                rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+                assert len(rejected) == 3, f"Every bad row in {path.name} should be rejected"
+                assert [reject["line"] for reject in rejected] == [7, 8, 9] if path == csv_path else [6, 7, 8], "Rejects should report line numbers in order"
+        
+        catalog = import_books(str(csv_path), columnar=True)
+        assert isinstance(catalog, Catalog) and list(catalog) == sample_books, "Columnar import should build a Catalog"
+        
+        books, new_arrivals = initialize_data(books_path=str(jsonl_path))
+        assert books == sample_books and len(new_arrivals) == 2, "initialize_data should load books from an export"
+        
+        jsonl_path.write_text(json.dumps({**sample_books[0], "id": "hello world"}) + "\n")
+        rejects = io.StringIO()
+        assert import_books(str(jsonl_path), rejects=rejects) == [], "Import should apply the same id pattern as validate_books"
+        assert "id must be a string matching" in json.loads(rejects.getvalue())["error"], "The reject should name the id check"
+        
+        with pytest.raises(ValueError):
+            iter_import_books(str(tmp_path / "books.txt"))
+        
+        test_obj.yakshaAssert("TestStreamingImport", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestStreamingImport", False, "functional")
+        pytest.fail(f"Streaming import test failed: {str(e)}")
+
+def test_streaming_exporters(test_obj, sample_books, sample_new_arrivals, tmp_path, capsys):
+    """Test that reports stream to files and stdout in text, CSV and JSON Lines"""
+    try:
+        import csv as csv_module
+        import io
+        import json
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        expected = {"citations": generate_citations(books), "availability": get_book_availability(books), "books": [get_formatted_book(book) for book in books]}
+        for make_collection in [lambda: books, lambda: Catalog(books), lambda: iter(books)]:
+            for report, lines in expected.items():
+                output = io.StringIO()
+                assert export_report(make_collection(), report, output, "text", batch_size=3) == len(books), "Export should report the row count"
+                assert output.getvalue().splitlines() == lines, f"Text {report} export should match"
+        
+        path = tmp_path / "citations.csv"
+        export_report(Catalog(books), "citations", str(path), "csv", batch_size=2)
+        with open(path, newline="") as csv_file:
+            rows = list(csv_module.reader(csv_file))
+        assert rows[0] == ["id", "citation"] and rows[1:] == [[book["id"], citation] for book, citation in zip(books, expected["citations"])], "CSV export should pair ids with citations"
+        
+        path = tmp_path / "availability.jsonl"
+        export_report(iter(books), "availability", path, "jsonl")
+        assert [json.loads(line) for line in path.read_text().splitlines()] == [{"id": book["id"], "availability": line} for book, line in zip(books, expected["availability"])], "JSONL export should match"
+        
+        export_report(books, "citations")
+        assert capsys.readouterr().out.splitlines() == expected["citations"], "Export should default to stdout"
+        
+        with pytest.raises(ValueError):
+            export_report(books, "citations", file_format="xml")
+        
+        test_obj.yakshaAssert("TestStreamingExporters", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestStreamingExporters", False, "functional")
+        pytest.fail(f"Streaming exporters test failed: {str(e)}")
+
+def test_paginated_display(test_obj, sample_books, sample_new_arrivals, capsys, monkeypatch):
+    """Test that display_data renders one page at a time and browse_data navigates pages"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        formatted = [get_formatted_book(book) for book in books]
+        
+        assert display_data(books, "books", page=2, page_size=3) == 3, "display_data should return the page count"
+        output = capsys.readouterr().out.splitlines()
+        assert output == ["", "Current Book Collection:"] + formatted[3:6] + ["Page 2 of 3"], "Second page should show books 4-6"
+        
+        display_data(iter(generate_citations(books)), "citations", page=3, page_size=3)
+        assert capsys.readouterr().out.splitlines()[2:] == [f"7. {generate_citations(books)[6]}"], "Iterators should be paged with numbering preserved"
+        
+        formatted_calls = []
+        monkeypatch.setattr("library_management_system.get_formatted_book", lambda book: formatted_calls.append(book["id"]) or book["id"])
+        display_data(books, "results", page=1, page_size=2)
+        assert formatted_calls == ["B001", "B002"], "Only the visible page should be formatted"
+        monkeypatch.undo()
+        capsys.readouterr()
+        
+        answers = iter(["n", "n", "n", "p", "q"])
+        monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+        browse_data(books, "books", page_size=3)
+        pages = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Page ")]
+        assert pages == ["Page 1 of 3", "Page 2 of 3", "Page 3 of 3", "Page 3 of 3", "Page 2 of 3"], "browse_data should move between pages"
+        
+        with pytest.raises(ValueError):
+            display_data(books, "books", page=0, page_size=3)
+        
+        test_obj.yakshaAssert("TestPaginatedDisplay", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestPaginatedDisplay", False, "functional")
+        pytest.fail(f"Paginated display test failed: {str(e)}")
+
+def test_format_cache(test_obj, sample_books, sample_new_arrivals, capsys):
+    """Test that formatted rows are cached per book and refreshed when the book changes"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        expected = [get_formatted_book(book) for book in books]
+        cache = FormatCache(maxsize=4)
+        books = subscribe(books, cache)
+        
+        assert [get_formatted_book(book, cache) for book in books[:3]] == expected[:3], "Cached rows should match uncached formatting"
+        assert [get_formatted_book(book, cache) for book in books[:3]] == expected[:3], "Repeated rows should come from the cache"
+        assert (cache.hits, cache.misses) == (3, 3), "Second pass should be all hits"
+        
+        update_availability(books, "B002", True)
+        assert get_formatted_book(books[1], cache) == get_formatted_book(books[1]), "Availability changes should invalidate the row"
+        assert "Available" in get_formatted_book(books[1], cache), "Refreshed row should show the new availability"
+        
+        for book in books:
+            get_formatted_book(book, cache)
+        assert len(cache) == 4, "The cache should stay within its size bound"
+        for position in range(1000):
+            get_formatted_book({**books[0], "id": f"X{position:05d}"}, cache)
+        assert len(cache) == 4, "Formatting many distinct books should not grow the cache"
+        
+        get_formatted_book(books[0], cache)
+        changed = {**books[0], "title": "Changed"}
+        assert get_formatted_book(changed, cache) == get_formatted_book(changed), "A different record with the same id should not get the cached row"
+        assert get_formatted_book(books[0], cache) == expected[0], "The original record should be formatted afresh"
+        
+        display_data(books, "books", cache=cache)
+        assert capsys.readouterr().out.splitlines()[2:] == [get_formatted_book(book) for book in books], "display_data should render cached rows"
+        
+        with pytest.raises(ValueError):
+            get_formatted_book({"id": "X001", "title": "Incomplete"}, cache)
+        with pytest.raises(ValueError):
+            FormatCache(maxsize=0)
+        
+        test_obj.yakshaAssert("TestFormatCache", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestFormatCache", False, "functional")
+        pytest.fail(f"Format cache test failed: {str(e)}")
+
+def test_query_cache(test_obj, sample_books, sample_new_arrivals):
+    """Test that repeated filters are served from the cache until the collection changes"""
+    try:
+        for make_collection in [list, Catalog]:
+            cache = QueryCache(maxsize=2)
+            books = subscribe(make_collection(initialize_data()[0]), cache)
+            
+            fiction = filter_by_genre(books, "fiction")
+            assert filter_by_genre(books, "fiction") == fiction == filter_by_genre(list(sample_books), "fiction"), "Cached results should match a scan"
+            assert (cache.hits, cache.misses) == (1, 1), "Repeated filters should hit the cache"
+            fiction.clear()
+            assert len(filter_by_genre(books, "fiction")) == 1, "Callers should not be able to change cached results"
+            
+            assert len(filter_by_availability(books)) == 3
+            update_availability(books, "B002", True)
+            assert len(filter_by_availability(books)) == 4, "Availability updates should invalidate cached results"
+            
+            books, report = upsert_new_arrivals(books, sample_new_arrivals)
+            assert [book["id"] for book in filter_by_decade(books, 2020)] == ["B004", "N001", "N002"], "New arrivals should invalidate cached results"
+            assert [book["id"] for book in filter_by_keyword(books, "data")] == ["N001"]
+            filter_by_genre(books, "reference")
+            assert len(cache) == 2, "The cache should stay within its size bound"
+            
+            with pytest.raises(TypeError):
+                filter_by_keyword(books, ["data"])
+            with pytest.raises(TypeError):
+                filter_by_availability(books, 1)
+            with pytest.raises(TypeError):
+                filter_by_decade(books, 2020.0)
+        
+        test_obj.yakshaAssert("TestQueryCache", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestQueryCache", False, "functional")
+        pytest.fail(f"Query cache test failed: {str(e)}")
+
+def test_sharded_execution(test_obj, sample_books, sample_new_arrivals, tmp_path, monkeypatch):
+    """Test that sharded runs on a process pool merge to the serial results in catalog order"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        path = tmp_path / "catalog.lbmc"
+        save_catalog(books, str(path))
+        calls = [(filter_by_genre, ("reference",)), (filter_by_availability, (False,)), (filter_by_decade, (2010,)), (filter_by_keyword, ("SIM",)), (calculate_genre_counts, ()), (calculate_average_popularity, ())]
+        for collection in [books, Catalog(books), load_catalog(str(path)), integrate_new_arrivals_view(sample_books, sample_new_arrivals)]:
+            for function, args in calls:
+                assert run_sharded(function, collection, *args, processes=2, shards=3) == function(collection, *args), f"Sharded {function.__name__} should match the serial result"
+        
+        mapped = load_catalog(str(path))
+        update_availability(mapped, "B002", True)
+        assert run_sharded(filter_by_availability, mapped, True, processes=2) == filter_by_availability(mapped, True), "Shards should see in-memory availability changes"
+        assert run_sharded(filter_by_genre, [], "fiction", processes=2) == [], "An empty collection should shard to an empty result"
+        
+        # Without fork, collections reach the workers through a snapshot file or per-chunk arguments
+        monkeypatch.setattr("library_management_system._fork_context", lambda: None)
+        for collection in [books, mapped]:
+            assert run_sharded(filter_by_availability, collection, True, processes=2) == filter_by_availability(collection, True), "Sharding should not need fork"
+        assert validate_books(books + [{**books[0], "id": "bad id"}], processes=2, chunk_size=3)["invalid"] == 1, "Validation should not need fork"
+        monkeypatch.undo()
+        
+        with pytest.raises(ValueError):
+            run_sharded(transform_titles, books)
+        with pytest.raises(TypeError):
+            run_sharded(filter_by_decade, books, "2010")
+        
+        test_obj.yakshaAssert("TestShardedExecution", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestShardedExecution", False, "functional")
+        pytest.fail(f"Sharded execution test failed: {str(e)}")
+
+def test_library_service(test_obj, sample_books, sample_new_arrivals):
+    """Test that the asyncio service matches the list functions, coalesces calls and answers over loopback"""
+    try:
+        import asyncio
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        service = LibraryService(books)
+        
+        async def exercise():
+            results = await asyncio.gather(*[service.filter_by_genre("reference") for _ in range(5)])
+            assert all(result == filter_by_genre(books, "reference") for result in results), "Coroutines should return the list function results"
+            assert (service.calls, service.coalesced) == (1, 4), "Identical concurrent calls should share one execution"
+            assert await service.transform_titles("lower") == transform_titles(books, "lower")
+            assert await service.generate_citations() == generate_citations(books)
+            assert await service.statistics() == aggregate_statistics(books)
+            with pytest.raises(TypeError):
+                await service.filter_by_decade("2010")
+            results = await asyncio.gather(service.filter_by_availability(True), service.filter_by_availability(1), return_exceptions=True)
+            assert results[0] == filter_by_availability(books, True) and isinstance(results[1], TypeError), "Equal arguments of different types should not be coalesced"
+            
+            server = await service.serve()
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                replies = await asyncio.gather(*[request_service("127.0.0.1", port, "filter_by_keyword", "sim") for _ in range(3)])
+                assert all(reply == filter_by_keyword(books, "sim") for reply in replies), "Loopback replies should carry the results"
+                assert await request_service("127.0.0.1", port, "calculate_genre_counts") == calculate_genre_counts(books)
+                with pytest.raises(RuntimeError):
+                    await request_service("127.0.0.1", port, "remove_book", "B001")
+        
+        asyncio.run(exercise())
+        assert len(books) == 7, "Service calls should not change the books"
+        
+        test_obj.yakshaAssert("TestLibraryService", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestLibraryService", False, "functional")
+        pytest.fail(f"Library service test failed: {str(e)}")
+
+def test_benchmark_harness(test_obj, sample_books, tmp_path):
+    """Test that the benchmark harness generates valid catalogs and reports every measured function"""
+    try:
+        import json
+        import benchmark
+        books, new_arrivals = benchmark.generate_catalog(200, seed=1)
+        assert books[:5] == sample_books and len(books) == 200 and len(new_arrivals) == 2, "Synthetic catalogs should extend the predefined books"
+        assert all(book["genre"] in GENRES and 1.0 <= book["popularity_score"] <= 5.0 and isinstance(book["available"], bool) for book in books), "Synthetic books should follow the input requirements"
+        assert benchmark.generate_books(50, seed=3) == benchmark.generate_books(50, seed=3), "Generation should be reproducible from the seed"
+        
+        path = tmp_path / "report.json"
+        assert benchmark.main(["--sizes", "50,100", "--repeat", "1", "--columnar", "--output", str(path)]) == 0
+        report = json.loads(path.read_text())
+        names = {name for name, call in benchmark.benchmark_calls(books, new_arrivals)}
+        assert {(result["function"], result["size"]) for result in report["results"]} == {(name, size) for name in names for size in [50, 100]}, "Every function should be measured at every size"
+        assert all(result["best_seconds"] >= 0 and result["peak_bytes"] >= 0 for result in report["results"])
+        
+        slower = {**report, "results": [{**result, "best_seconds": result["best_seconds"] * 2 + 1} for result in report["results"]]}
+        assert len(benchmark.find_regressions(slower, report)) == len(report["results"]), "Slower results should be reported as regressions"
+        assert benchmark.find_regressions(report, slower) == []
+        
+        test_obj.yakshaAssert("TestBenchmarkHarness", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestBenchmarkHarness", False, "functional")
+        pytest.fail(f"Benchmark harness test failed: {str(e)}")
+
+def test_profiler(test_obj, sample_books, sample_new_arrivals):
+    """Test that the profiler records library calls only while it is active"""
+    try:
+        import json
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        filter_by_genre(books, "fiction")
+        assert get_profiler() is None, "Profiling should be off by default"
+        
+        with Profiler() as profiler:
+            assert get_profiler() is profiler
+            filter_by_genre(books, "reference")
+            filter_by_genre(books, "fiction")
+            aggregate_statistics(books)
+        assert get_profiler() is None, "Leaving the block should turn profiling off"
+        filter_by_genre(books, "children")
+        
+        profile = profiler.to_dict()
+        assert set(profile) == {"filter_by_genre", "aggregate_statistics"}, "Only calls made while active should be recorded"
+        genre_stats = profile["filter_by_genre"]
+        assert genre_stats["calls"] == 2 and genre_stats["rows_in"] == 14 and genre_stats["rows_returned"] == 3, "Calls and rows should be counted"
+        assert sum(genre_stats["histogram"].values()) == 2 and genre_stats["max_seconds"] >= genre_stats["mean_seconds"] > 0
+        assert json.loads(profiler.dump("json")) == profile, "JSON dump should carry the profile"
+        assert profiler.dump().splitlines()[0].split()[:2] == ["function", "calls"], "Text dump should be a table"
+        
+        @Profiler()
+        def profiled_citations():
+            return get_profiler(), generate_citations(books)
+        decorated, citations = profiled_citations()
+        assert decorated.to_dict()["generate_citations"]["rows_returned"] == len(citations), "The profiler should also work as a decorator"
+        
+        test_obj.yakshaAssert("TestProfiler", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestProfiler", False, "functional")
+        pytest.fail(f"Profiler test failed: {str(e)}")
+
+def test_validated_catalog(test_obj, sample_books, sample_new_arrivals, capsys, monkeypatch):
+    """Test that records are checked once at ingest and trusted rows skip the per-row field checks"""
+    try:
+        books = validate_catalog(sample_books)
+        assert isinstance(books, ValidatedBooks) and books == sample_books, "validate_catalog should return the same books as a ValidatedBooks"
+        assert filter_by_genre(books, "fiction") == filter_by_genre(sample_books, "fiction")
+        
+        with pytest.raises(ValueError) as error:
+            validate_catalog(sample_books + [{"id": "M001", "title": "Malformed"}])
+        assert "position 5" in str(error.value) and "author" in str(error.value), "The error should name the row and the missing field"
+        with pytest.raises(TypeError):
+            validate_catalog([sample_books[0], "not a book"])
+        with pytest.raises(ValueError):
+            books.append({"id": "M002"})
+        with pytest.raises(ValueError):
+            books[0] = {"id": "M003"}
+        assert len(books) == 5, "Rejected rows should not be stored"
+        
+        integrated = integrate_new_arrivals(books, sample_new_arrivals)
+        assert isinstance(integrated, ValidatedBooks) and len(integrated) == 7, "Integration should keep the collection validated"
+        with pytest.raises(ValueError):
+            integrate_new_arrivals(books, [{"id": "M004", "title": "Malformed"}])
+        
+        inserted = build_index(validate_catalog(list(sample_books)))
+        inserted.insert(0, dict(sample_new_arrivals[0]))
+        assert [book["id"] for book in filter_by_genre(inserted, "reference")] == ["N001", "B001"], "Inserting should keep the index positions right"
+        with pytest.raises(ValueError):
+            inserted.insert(0, {"id": "M005"})
+        indexed = build_index(integrated)
+        assert indexed is integrated, "Indexing should keep the validated collection"
+        
+        expected = [get_formatted_book(book) for book in integrated]
+        monkeypatch.setattr("library_management_system.get_formatted_book", lambda book: pytest.fail("Trusted rows should not be re-checked"))
+        display_data(integrated, "books")
+        monkeypatch.undo()
+        assert capsys.readouterr().out.splitlines()[2:] == expected, "Trusted rows should format the same way"
+        
+        test_obj.yakshaAssert("TestValidatedCatalog", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestValidatedCatalog", False, "functional")
+        pytest.fail(f"Validated catalog test failed: {str(e)}")
+
+def test_bulk_validation(test_obj, sample_books, sample_new_arrivals):
+    """Test that validate_books reports every schema violation without raising"""
+    try:
+        books = sample_books + sample_new_arrivals
+        report = validate_books(books)
+        assert report == {"total": 7, "valid": 7, "invalid": 0, "errors": [], "truncated": False}, "Predefined books should be valid"
+        
+        bad_books = books + [
+            {**books[0], "id": "b-001"},
+            {**books[1], "genre": "poetry", "popularity_score": 9.5},
+            {**books[2], "publication_year": "2015", "available": 1},
+            {"id": "M001", "title": "Malformed"},
+            "not a book",
+        ]
+        for processes in [None, 2]:
+            report = validate_books(bad_books, processes=processes, chunk_size=3)
+            assert (report["total"], report["valid"], report["invalid"]) == (12, 7, 5), "Invalid rows should be counted"
+            assert [error["position"] for error in report["errors"]] == [7, 8, 9, 10, 11], "Errors should be reported in catalog order"
+            assert [[entry["field"] for entry in error["errors"]] for error in report["errors"][:3]] == [["id"], ["genre", "popularity_score"], ["publication_year", "available"]], "Every bad field should be listed"
+            assert report["errors"][3]["id"] == "M001" and len(report["errors"][3]["errors"]) == 5, "Missing fields should be listed"
+        
+        nan_books = books + [{**books[3], "popularity_score": float("nan")}]
+        assert [error["position"] for error in validate_books(nan_books)["errors"]] == [7], "A NaN score past the first row should be caught"
+        with pytest.raises(ValueError):
+            validate_catalog(nan_books, strict=True)
+        assert validate_books(Catalog(books))["valid"] == 7, "Catalogs should validate"
+        assert validate_books(bad_books, id_pattern=r"[A-Za-z]+-?[0-9]+")["invalid"] == 4, "The id pattern should be configurable"
+        truncated = validate_books(bad_books, max_errors=2)
+        assert len(truncated["errors"]) == 2 and truncated["truncated"] and truncated["invalid"] == 5, "The error list should be bounded"
+        
+        with pytest.raises(ValueError):
+            validate_catalog(bad_books[:9], strict=True)
+        assert len(validate_catalog(books, strict=True)) == 7, "Strict validation should accept valid books"
+        
+        test_obj.yakshaAssert("TestBulkValidation", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestBulkValidation", False, "functional")
+        pytest.fail(f"Bulk validation test failed: {str(e)}")
+
+def test_year_range_index(test_obj, sample_books, sample_new_arrivals):
+    """Test that year range filters agree across collections and the sorted year index stays current"""
+    try:
+        books = integrate_new_arrivals(sample_books, sample_new_arrivals)
+        expected = {(2016, 2019): ["B001", "B002", "B005"], (2020, None): ["B004", "N001", "N002"], (None, 2015): ["B003"], (2024, None): []}
+        for collection in [books, Catalog(books), build_index(list(books)), build_index(Catalog(books))]:
+            for (start, end), ids in expected.items():
+                assert [book["id"] for book in filter_by_year_range(collection, start, end)] == ids, f"Years {start}-{end} should match"
+            for decade in [2010, 2020, 2015, 1990]:
+                assert filter_by_decade(collection, decade) == filter_by_decade(books, decade), "Decade filters should agree with the scan"
+        
+        indexed = build_index(list(sample_books))
+        for position in range(300):
+            indexed.append({**sample_books[position % 5], "id": f"X{position:03d}", "publication_year": 2024 - position % 40})
+        assert len(indexed.book_index.year_index) == 305, "Every appended book should be indexed"
+        assert filter_by_year_range(indexed, 1990, 1999) == filter_by_year_range(list(indexed), 1990, 1999), "Buffered and merged years should be found"
+        indexed, report = upsert_new_arrivals(indexed, [{**sample_books[2], "publication_year": 1999}])
+        assert [book["id"] for book in filter_by_decade(indexed, 2010)] == [book["id"] for book in filter_by_decade(list(indexed), 2010)], "Updated years should move in the index"
+        assert sample_books[2]["id"] in [book["id"] for book in filter_by_year_range(indexed, 1999, 1999)]
+        
+        with pytest.raises(ValueError):
+            filter_by_year_range(books, 2020, 2010)
+        with pytest.raises(TypeError):
+            filter_by_year_range(books, "1995")
+        
+        test_obj.yakshaAssert("TestYearRangeIndex", True, "functional")
+    except Exception as e:
+        test_obj.yakshaAssert("TestYearRangeIndex", False, "functional")
+        pytest.fail(f"Year range index test failed: {str(e)}")
+
 if __name__ == '__main__':
     pytest.main(['-v'])
\ No newline at end of file